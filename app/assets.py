@@ -0,0 +1,174 @@
+"""Content-hashed, precompressed static assets and the handler that serves them.
+
+Build once per release (the Dockerfile does)::
+
+    python -m app.assets
+
+This writes ``app/static/dist/``: ``ui.<hash>.js`` / ``styles.<hash>.css``,
+``ui.html`` rewritten to reference them, ``.gz`` and ``.br`` variants of each
+(``.br`` only if the ``brotli`` package is installed) and ``manifest.json``.
+Hashed files never change, so they are sent with an immutable year-long
+``Cache-Control``. Pages revalidate (``no-cache`` + ETag), so a repeat load
+sends one 304 and no asset bytes. Without a build, the source files are
+served as before.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+STATIC_DIR = Path(__file__).parent / "static"
+DIST = "dist"
+# Referenced from pages as /static/<name>; replaced by their hashed copies
+HASHED_ASSETS = ("ui.js", "styles.css")
+PAGES = ("ui.html",)
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.\w+$")
+_ASSET_REF = re.compile(r"/static/([\w.-]+?)(?:\?[^\"']*)?(?=[\"'])")
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+@lru_cache(maxsize=256)
+def _content_etag(path: str, mtime_ns: int, size: int) -> str:
+    """ETag from the file's bytes; the stat fields only key the cache."""
+    with open(path, "rb") as f:
+        return f'"{hashlib.sha256(f.read()).hexdigest()[:16]}"'
+
+
+def _write_variants(path: Path, data: bytes) -> None:
+    path.write_bytes(data)
+    # mtime=0 keeps the .gz bytes (and so its ETag) stable across builds
+    path.with_name(path.name + ".gz").write_bytes(
+        gzip.compress(data, compresslevel=9, mtime=0)
+    )
+    brotli = _brotli()
+    if brotli is not None:
+        path.with_name(path.name + ".br").write_bytes(
+            brotli.compress(data, quality=11)
+        )
+
+
+def build(static_dir: Path = STATIC_DIR) -> dict[str, str]:
+    """Write ``static_dir/dist`` and return the name -> hashed name manifest."""
+    out = static_dir / DIST
+    shutil.rmtree(out, ignore_errors=True)
+    out.mkdir()
+    manifest = {}
+    for name in HASHED_ASSETS:
+        data = (static_dir / name).read_bytes()
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+        _write_variants(out / hashed, data)
+        manifest[name] = hashed
+
+    def hashed_ref(m):
+        name = m.group(1)
+        return f"/static/{DIST}/{manifest[name]}" if name in manifest else m.group(0)
+
+    for page in PAGES:
+        html = (static_dir / page).read_text(encoding="utf-8")
+        _write_variants(out / page, _ASSET_REF.sub(hashed_ref, html).encode())
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Codings the client accepts (q > 0) from an Accept-Encoding header."""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class AssetFiles(StaticFiles):
+    """StaticFiles that serves precompressed variants and cache headers.
+
+    For ``x.js`` it sends ``x.js.br`` or ``x.js.gz`` when present and
+    accepted (with the original media type and ``Content-Encoding``), marks
+    content-hashed names immutable, and makes everything else revalidate.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+        immutable = _HASHED_NAME.search(full_path) is not None
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        encoding = None
+        for coding, suffix in ENCODINGS:
+            if coding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(full_path + suffix)
+            except FileNotFoundError:
+                continue
+            full_path, stat_result, encoding = (
+                full_path + suffix, variant_stat, coding
+            )
+            break
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            media_type=media_type,
+        )
+        # FileResponse derives the ETag from mtime and size, which every
+        # rebuild changes; unchanged bytes keep their ETag across deploys
+        response.headers["ETag"] = _content_etag(
+            full_path, stat_result.st_mtime_ns, stat_result.st_size
+        )
+        response.headers["Cache-Control"] = IMMUTABLE if immutable else REVALIDATE
+        response.headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def page(self, name: str, scope) -> FileResponse:
+        """Serve a page from the build if there is one, else its source."""
+        for candidate in (f"{DIST}/{name}", name):
+            full_path, stat_result = self.lookup_path(candidate)
+            if stat_result is not None:
+                return self.file_response(full_path, stat_result, scope)
+        raise FileNotFoundError(name)
+
+
+if __name__ == "__main__":
+    static_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else STATIC_DIR
+    for name, hashed in build(static_dir).items():
+        print(f"{name} -> {DIST}/{hashed}")
+    if _brotli() is None:
+        print("brotli not installed: wrote gzip variants only")
@@ -0,0 +1,84 @@
+"""In-process caches validated against ``table_versions`` counters."""
+import threading
+
+from prometheus_client import Counter
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from . import models
+
+CACHE_HITS = Counter("app_cache_hits_total", "In-process cache hits", ["cache"])
+CACHE_MISSES = Counter("app_cache_misses_total", "In-process cache misses", ["cache"])
+
+
+def get_version(db: Session, name: str) -> int:
+    v = db.scalar(
+        select(models.TableVersion.version).where(models.TableVersion.name == name)
+    )
+    return v or 0
+
+
+def get_versions(db: Session, names: tuple[str, ...]) -> tuple[int, ...]:
+    """Counters for several tables, in ``names`` order, with one query."""
+    rows = dict(
+        db.execute(
+            select(models.TableVersion.name, models.TableVersion.version).where(
+                models.TableVersion.name.in_(names)
+            )
+        ).all()
+    )
+    return tuple(rows.get(name) or 0 for name in names)
+
+
+def bump_version(db: Session, name: str) -> None:
+    """Increment the counter for ``name``; committed with the caller's write."""
+    result = db.execute(
+        update(models.TableVersion)
+        .where(models.TableVersion.name == name)
+        .values(version=models.TableVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(models.TableVersion(name=name, version=1))
+
+
+class VersionedCache:
+    """Holds values per database (and optional key), valid while the
+    versions of ``tables`` match.
+
+    ``tables`` is one table name or a tuple of them. At most ``max_entries``
+    keyed values are kept per cache; the oldest is dropped first.
+    """
+
+    def __init__(self, name: str, tables: str | tuple[str, ...], max_entries=64):
+        self.name = name
+        self.tables = (tables,) if isinstance(tables, str) else tuple(tables)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, tuple[tuple[int, ...], object]] = {}
+
+    def get_or_load(self, db: Session, loader, key=None, version=None):
+        """``version`` skips the lookup when the caller has already read the
+        counters of ``tables`` (in the same order) in this request."""
+        # Read the versions before loading so a concurrent write can only make
+        # the stored value newer than its versions, never older.
+        key = (str(db.get_bind().url), key)
+        if version is None:
+            version = tuple(get_version(db, t) for t in self.tables)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            CACHE_HITS.labels(cache=self.name).inc()
+            return entry[1]
+        CACHE_MISSES.labels(cache=self.name).inc()
+        value = loader(db)
+        with self._lock:
+            current = self._entries.get(key)
+            if current is None or all(map(int.__le__, current[0], version)):
+                self._entries.pop(key, None)
+                self._entries[key] = (version, value)
+                while len(self._entries) > self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
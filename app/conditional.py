@@ -0,0 +1,35 @@
+"""ETag / If-None-Match handling for GETs backed by ``table_versions``."""
+from fastapi import Request, Response
+
+from .cache import get_version
+
+# Patient data: browsers may store it but must revalidate before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_for(table: str, version: int) -> str:
+    return f'"{table}-v{version}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+def conditional(request: Request, response: Response, etag: str) -> Response | None:
+    """Set caching headers; return a 304 response if the client copy is current."""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def table_etag(db, table: str) -> str:
+    return etag_for(table, get_version(db, table))
@@ -0,0 +1,68 @@
+"""Runtime configuration read from environment variables."""
+import os
+from dataclasses import dataclass, fields
+
+
+def _env_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: str = "sqlite:///./rehab.db"
+    # Serve the exercise/session CRUD routes from AsyncSession (aiosqlite)
+    db_async: bool = False
+    # Connection pool (ignored for in-memory SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    # SQLite connection tuning, applied on every new connection
+    sqlite_tuning: bool = True
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
+    # Comma-separated upper bounds in seconds; empty = prometheus_client default
+    metrics_latency_buckets: str = ""
+    # How long /readyz reuses its last database check
+    readiness_ttl_s: float = 5.0
+    # Adds per-request X-DB-Queries / X-DB-Time-Ms response headers
+    debug: bool = False
+    # Statements at least this slow are logged (with their query plan) to the
+    # app.slow_query logger; the sample rate bounds the log volume
+    slow_query_ms: float = 200.0
+    slow_query_sample_rate: float = 1.0
+    # Batch concurrent POST /sessions inserts into shared transactions: a
+    # batch closes after the window or at the size limit, whichever is first
+    session_group_commit: bool = False
+    group_commit_max_batch: int = 200
+    group_commit_window_ms: float = 2.0
+
+    def latency_buckets(self) -> tuple[float, ...]:
+        from prometheus_client import Histogram
+
+        if not self.metrics_latency_buckets.strip():
+            return Histogram.DEFAULT_BUCKETS
+        bounds = sorted(float(b) for b in self.metrics_latency_buckets.split(","))
+        return (*bounds, float("inf"))
+
+    @classmethod
+    def from_env(cls, environ=None) -> "Settings":
+        """Build settings from upper-cased field names, e.g. DATABASE_URL."""
+        environ = os.environ if environ is None else environ
+        values = {}
+        for f in fields(cls):
+            raw = environ.get(f.name.upper())
+            if raw is None:
+                continue
+            if f.type in (bool, "bool"):
+                values[f.name] = _env_bool(raw)
+            elif f.type in (int, "int"):
+                values[f.name] = int(raw)
+            elif f.type in (float, "float"):
+                values[f.name] = float(raw)
+            else:
+                values[f.name] = raw
+        return cls(**values)
+
+
+settings = Settings.from_env()
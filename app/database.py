@@ -1,21 +1,138 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./rehab.db"
+from .config import Settings, settings
+from .db_metrics import instrument_engine
+from .metrics import TimedCheckout
 
-# Needed for SQLite in single-threaded dev servers
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+SQLALCHEMY_DATABASE_URL = settings.database_url
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    if not url.startswith("sqlite"):
+        return False
+    return ":memory:" in url or url.rstrip("/") == "sqlite:"
+
+
+def configure_sqlite(engine: Engine, cfg: Settings) -> None:
+    """Set WAL journaling and connection pragmas on each new SQLite connection."""
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        # WAL lets readers proceed while a writer holds the lock
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute(f"PRAGMA busy_timeout={int(cfg.sqlite_busy_timeout_ms)}")
+        cur.execute(f"PRAGMA mmap_size={int(cfg.sqlite_mmap_size)}")
+        # Negative cache_size is in KiB rather than pages
+        cur.execute(f"PRAGMA cache_size=-{int(cfg.sqlite_cache_size_kib)}")
+        cur.close()
+
+
+def enable_foreign_keys(engine: Engine) -> None:
+    """Enforce FOREIGN KEY constraints (and ON DELETE CASCADE) on SQLite.
+
+    SQLite leaves them off per connection unless asked, whatever the schema
+    says, so this is applied to every SQLite engine, tuned or not.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _foreign_keys_on(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA foreign_keys=ON")
+        cur.close()
+
+
+class TimedQueuePool(TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def async_url(url: str) -> str:
+    """Swap a sync SQLite URL onto the aiosqlite driver."""
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+def make_async_engine(cfg: Settings):
+    # Imported here so aiosqlite is only required when async mode is on
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = async_url(cfg.database_url)
+    kwargs = {}
+    if not _is_memory_sqlite(cfg.database_url):
+        # aiosqlite defaults to NullPool; pool explicitly so sizing applies
+        kwargs.update(
+            poolclass=TimedAsyncQueuePool,
+            pool_size=cfg.db_pool_size,
+            max_overflow=cfg.db_max_overflow,
+            pool_timeout=cfg.db_pool_timeout,
+        )
+    engine = create_async_engine(url, **kwargs)
+    instrument_engine(engine.sync_engine, cfg)
+    if url.startswith("sqlite"):
+        enable_foreign_keys(engine.sync_engine)
+    if url.startswith("sqlite") and cfg.sqlite_tuning:
+        configure_sqlite(engine.sync_engine, cfg)
+    return engine
+
+
+def make_engine(cfg: Settings) -> Engine:
+    url = cfg.database_url
+    kwargs = {}
+    if url.startswith("sqlite"):
+        # Needed for SQLite when connections are shared across threadpool workers
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if not _is_memory_sqlite(url):
+        kwargs.update(
+            poolclass=TimedQueuePool,
+            pool_size=cfg.db_pool_size,
+            max_overflow=cfg.db_max_overflow,
+            pool_timeout=cfg.db_pool_timeout,
+        )
+    engine = create_engine(url, **kwargs)
+    instrument_engine(engine, cfg)
+    if url.startswith("sqlite"):
+        enable_foreign_keys(engine)
+    if url.startswith("sqlite") and cfg.sqlite_tuning:
+        configure_sqlite(engine, cfg)
+    return engine
+
+
+engine = make_engine(settings)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-# Dependency for FastAPI routes
-def get_db():
-    db = SessionLocal()
+AsyncSessionLocal = None
+if settings.db_async:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = make_async_engine(settings)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+# Dependency for FastAPI routes. Apps built by create_app() with their own
+# settings carry their own session factories on app.state.
+def get_db(request: Request):
+    factory = getattr(request.app.state, "session_factory", None) or SessionLocal
+    db = factory()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    factory = getattr(request.app.state, "async_session_factory", None)
+    async with (factory or AsyncSessionLocal)() as db:
+        yield db
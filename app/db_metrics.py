@@ -0,0 +1,170 @@
+"""SQL statement metrics, per-request query counts and the slow-query log.
+
+``instrument_engine`` hooks an engine's cursor events:
+
+- every statement is timed into ``db_query_duration_seconds``, labelled by a
+  fingerprint (verb, first table and a hash of the normalized SQL, so literal
+  values and IN-list lengths do not create new series) and by the
+  ``app/services`` function that issued it;
+- statements slower than ``SLOW_QUERY_MS`` are logged, with SQLite's
+  ``EXPLAIN QUERY PLAN``, to the ``app.slow_query`` logger (sampled by
+  ``SLOW_QUERY_SAMPLE_RATE``);
+- inside ``QueryCountMiddleware`` (added when ``DEBUG`` is on) the
+  statements of each request are counted into ``X-DB-Queries`` and
+  ``X-DB-Time-Ms`` response headers, which makes N+1 patterns visible.
+"""
+import hashlib
+import logging
+import os
+import random
+import re
+import sys
+import time
+from contextvars import ContextVar
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+
+log = logging.getLogger("app.slow_query")
+
+QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency",
+    ["fingerprint", "caller"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+_SERVICES_DIR = os.path.join(os.path.dirname(__file__), "services") + os.sep
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+\"?(\w+)", re.IGNORECASE)
+
+_fingerprints: dict[str, str] = {}
+
+
+def normalize(statement: str) -> str:
+    """SQL with literals as ``?``, IN lists as ``(...)`` and single spaces."""
+    sql = _LITERALS.sub("?", statement)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def fingerprint(statement: str) -> str:
+    """Short stable label, e.g. ``SELECT sessions 1a2b3c4d``."""
+    fp = _fingerprints.get(statement)
+    if fp is None:
+        sql = normalize(statement)
+        table = _TABLE.search(sql)
+        digest = hashlib.sha1(sql.encode()).hexdigest()[:8]
+        verb = sql.split(" ", 1)[0].upper()
+        fp = f"{verb} {table.group(1) if table else '-'} {digest}"
+        # Statements come from a fixed set of code paths, so this stays small
+        if len(_fingerprints) < 10_000:
+            _fingerprints[statement] = fp
+    return fp
+
+
+def caller() -> str:
+    """Innermost ``app/services`` function on the stack, as ``module.function``."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        # Comprehensions (<listcomp>, <genexpr>) report their enclosing function
+        if path.startswith(_SERVICES_DIR) and not frame.f_code.co_name.startswith("<"):
+            module = os.path.splitext(path[len(_SERVICES_DIR):])[0]
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "-"
+
+
+class RequestQueries:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+_request_queries: ContextVar[RequestQueries | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    if conn.dialect.name != "sqlite" or not isinstance(parameters, (tuple, list)):
+        return "(not available)"
+    cur = conn.connection.dbapi_connection.cursor()
+    try:
+        cur.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return "\n".join(f"  {row[-1]}" for row in cur.fetchall())
+    except Exception as exc:  # the plan is best effort; never fail the request
+        return f"(unavailable: {exc})"
+    finally:
+        cur.close()
+
+
+def instrument_engine(engine, cfg) -> None:
+    """Attach statement timing, request counting and slow-query logging."""
+    slow_s = cfg.slow_query_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        # On the per-statement context, not the connection: a statement that
+        # raises never reaches _end, and nothing would remove its start time
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        fp, who = fingerprint(statement), caller()
+        QUERY_LATENCY.labels(fp, who).observe(elapsed)
+        stats = _request_queries.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+        if (
+            elapsed >= slow_s
+            and not executemany
+            and random.random() < cfg.slow_query_sample_rate
+        ):
+            log.warning(
+                "slow query %.1f ms [%s] caller=%s\n%s\nplan:\n%s",
+                elapsed * 1000,
+                fp,
+                who,
+                normalize(statement),
+                _explain(conn, statement, parameters),
+            )
+
+
+class QueryCountMiddleware:
+    """Adds X-DB-Queries / X-DB-Time-Ms to every response (debug mode only)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # A mutable holder: threadpool-run sync routes see a copy of the
+        # context, but the same object, so their statements are counted here.
+        stats = RequestQueries()
+        token = _request_queries.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append(
+                    (b"x-db-time-ms", f"{stats.seconds * 1000:.2f}".encode())
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_queries.reset(token)
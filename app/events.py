@@ -0,0 +1,122 @@
+"""In-process change feed served as Server-Sent Events by ``GET /events``.
+
+Service functions publish after committing a write. Each event gets an id
+``<epoch>-<seq>``; the last ``HISTORY`` events are kept so a client that
+reconnects with ``Last-Event-ID`` receives what it missed. When that is not
+possible (the id is older than the buffer, or from before a restart, which
+changes the epoch) the client gets a ``reset`` event and should reload.
+
+The feed is per process: with several workers a client only sees the writes
+made by the worker it is connected to.
+"""
+import asyncio
+import secrets
+import threading
+from collections import deque
+from typing import NamedTuple
+
+import orjson
+from prometheus_client import Gauge
+
+# Events kept for Last-Event-ID resume
+HISTORY = 1000
+# Undelivered events per connection; a client this far behind is disconnected
+# and resumes from the history when it reconnects
+QUEUE_SIZE = 256
+
+
+class Event(NamedTuple):
+    id: str
+    type: str
+    # Encoded JSON
+    data: bytes
+
+    def encode(self) -> bytes:
+        return b"id: %s\nevent: %s\ndata: %s\n\n" % (
+            self.id.encode(), self.type.encode(), self.data
+        )
+
+
+class EventBus:
+    """Fan-out of published events to subscribed asyncio queues.
+
+    ``publish`` may be called from any thread (sync routes run in the
+    threadpool); events are handed to each subscriber's event loop.
+    """
+
+    def __init__(self, history: int = HISTORY, queue_size: int = QUEUE_SIZE):
+        self.epoch = secrets.token_hex(4)
+        self.queue_size = queue_size
+        self._seq = 0
+        self._history: deque[Event] = deque(maxlen=history)
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self) -> str:
+        return f"{self.epoch}-{self._seq}"
+
+    def publish(self, type: str, data) -> Event:
+        with self._lock:
+            self._seq += 1
+            event = Event(self.last_id, type, orjson.dumps(data))
+            self._history.append(event)
+            # Scheduled under the lock so concurrent publishers reach each
+            # loop in seq order (callbacks run FIFO)
+            for queue, loop in list(self._subscribers.items()):
+                try:
+                    loop.call_soon_threadsafe(self._deliver, queue, event)
+                except RuntimeError:  # the subscriber's loop has closed
+                    del self._subscribers[queue]
+        return event
+
+    def _deliver(self, queue: asyncio.Queue, event: Event) -> None:
+        if queue not in self._subscribers:
+            return
+        if queue.qsize() >= self.queue_size - 1:
+            # Keep the last slot for the None that ends the stream
+            self.unsubscribe(queue)
+            queue.put_nowait(None)
+        else:
+            queue.put_nowait(event)
+
+    def subscribe(
+        self, last_event_id: str | None = None
+    ) -> tuple[asyncio.Queue, list[Event] | None, str]:
+        """Register a queue for new events; call from the consuming loop.
+
+        Returns the queue, the events after ``last_event_id`` (None if they
+        are no longer available) and the id of the latest event, taken
+        atomically so nothing is missed or sent twice.
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+            return queue, self._since(last_event_id), self.last_id
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def _since(self, last_event_id: str | None) -> list[Event] | None:
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq:
+            return None
+        missed = self._seq - int(seq)
+        if missed > len(self._history):
+            return None
+        # Ids are consecutive, so the missed events are the newest ``missed``
+        return list(self._history)[len(self._history) - missed:]
+
+
+bus = EventBus()
+
+EVENT_SUBSCRIBERS = Gauge("events_subscribers", "Open /events streams")
+EVENT_SUBSCRIBERS.set_function(lambda: len(bus._subscribers))
+
+
+def publish(type: str, data) -> None:
+    """Publish to the process-wide bus; call after the write has committed."""
+    bus.publish(type, data)
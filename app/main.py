@@ -1,73 +1,117 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
-from .database import Base, engine
-from .routers import exercises, sessions, health
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse
-import time
-from prometheus_client import Counter, Histogram
-
-# Create tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(title="Knee Rehab Habit Tracker", version="0.1.0")
-
-app.include_router(exercises.router)
-app.include_router(sessions.router)
-app.include_router(health.router)
-
-# Prometheus metrics
-REQUEST_COUNT = Counter(
-    "http_requests_total",
-    "Total HTTP requests",
-    ["method", "path", "status"],
-)
-REQUEST_LATENCY = Histogram(
-    "http_request_duration_seconds",
-    "HTTP request latency",
-    ["method", "path"],
-)
-ERROR_COUNT = Counter(
-    "http_request_errors_total",
-    "Total HTTP request errors",
-    ["method", "path", "status"],
-)
-
-
-@app.get("/")
-@app.get("/", include_in_schema=False)
-def root():
-    return RedirectResponse(url="/ui")
-
-
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
-
-
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    start = time.perf_counter()
-    method = request.method
-    path = request.url.path
-    try:
-        response = await call_next(request)
-        status = str(response.status_code)
-        return response
-    except Exception:
-        # increment error counter and re-raise
-        ERROR_COUNT.labels(method=method, path=path, status="500").inc()
-        raise
-    finally:
-        # Observe latency and increment counters
-        elapsed = time.perf_counter() - start
-        # If response is available in finally, get status; otherwise default to 500
-        try:
-            status = str(response.status_code)
-        except Exception:
-            status = "500"
-        REQUEST_COUNT.labels(method=method, path=path, status=status).inc()
-        REQUEST_LATENCY.labels(method=method, path=path).observe(elapsed)
-
-
-@app.get("/ui", response_class=HTMLResponse)
-def ui_page():
-    return FileResponse("app/static/ui.html", media_type="text/html")
+from fastapi.responses import HTMLResponse, RedirectResponse
+from sqlalchemy.orm import sessionmaker
+
+from . import database
+from .assets import STATIC_DIR, AssetFiles
+from .config import Settings, settings
+from .db_metrics import QueryCountMiddleware
+from .metrics import POOLS, MetricsMiddleware
+from .routers import adherence, dashboard, events, exercises, sessions, health
+
+
+def _own_engines(app: FastAPI, cfg: Settings) -> None:
+    """Give an app built for non-default settings its own engines."""
+    app.state.engine = database.make_engine(cfg)
+    app.state.session_factory = sessionmaker(
+        autocommit=False, autoflush=False, bind=app.state.engine
+    )
+    if cfg.db_async:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        app.state.async_engine = database.make_async_engine(cfg)
+        app.state.async_session_factory = async_sessionmaker(
+            app.state.async_engine, autoflush=False, expire_on_commit=False
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Deferred so importing the app (workers, tests, CLI tools) never touches
+    # the database; only a starting server does.
+    from .migrations import ensure_schema
+
+    engine = getattr(app.state, "engine", None)
+    async_engine = getattr(app.state, "async_engine", None)
+    # database.engine is looked up now, not at import, so tests can swap it
+    sync_pool = engine or database.engine
+    ensure_schema(sync_pool)
+    POOLS.track("sync", sync_pool)
+    async_pool = async_engine
+    if async_pool is None and database.AsyncSessionLocal is not None:
+        async_pool = database.async_engine
+    if async_pool is not None:
+        POOLS.track("async", async_pool)
+    cfg = app.state.settings
+    writer = None
+    if cfg.session_group_commit:
+        from .services.group_commit import GroupCommitWriter
+
+        writer = GroupCommitWriter(
+            getattr(app.state, "session_factory", None) or database.SessionLocal,
+            cfg.group_commit_max_batch,
+            cfg.group_commit_window_ms / 1000,
+        )
+        writer.start()
+    app.state.session_writer = writer
+    yield
+    if writer is not None:
+        writer.stop()
+    POOLS.untrack("sync", sync_pool)
+    POOLS.untrack("async", async_pool)
+    if engine is not None:
+        engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+def create_app(cfg: Settings | None = None) -> FastAPI:
+    """Build the application; ``cfg`` defaults to settings from the environment.
+
+    With the default settings the module-level engine and sessions in
+    ``app.database`` are used; other settings get engines owned by the app.
+    """
+    cfg = cfg or settings
+    app = FastAPI(
+        title="Knee Rehab Habit Tracker", version="0.1.0", lifespan=lifespan
+    )
+    app.state.settings = cfg
+    if cfg is not settings:
+        _own_engines(app, cfg)
+
+    if cfg.db_async:
+        from .routers import exercises_async, sessions_async
+
+        # First match wins, so these shadow the sync CRUD routes
+        app.include_router(exercises_async.router)
+        app.include_router(sessions_async.router)
+    app.include_router(exercises.router)
+    app.include_router(sessions.router)
+    app.include_router(adherence.router)
+    app.include_router(dashboard.router)
+    app.include_router(events.router)
+    app.include_router(health.router)
+
+    app.add_middleware(MetricsMiddleware)
+    if cfg.debug:
+        app.add_middleware(QueryCountMiddleware)
+
+    @app.get("/")
+    @app.get("/", include_in_schema=False)
+    def root():
+        return RedirectResponse(url="/ui")
+
+    static_files = AssetFiles(directory=STATIC_DIR)
+    app.mount("/static", static_files, name="static")
+
+    @app.get("/ui", response_class=HTMLResponse)
+    def ui_page(request: Request):
+        # The built page references hashed, precompressed assets
+        return static_files.page("ui.html", request.scope)
+
+    return app
+
 
+app = create_app()
@@ -0,0 +1,140 @@
+"""HTTP request and connection-pool metrics, and the ASGI middleware that
+records the former."""
+import threading
+import time
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+from .config import settings
+
+# Label for requests that matched no route (404s, scanners, typos), so junk
+# paths cannot create new time series.
+UNMATCHED = "<unmatched>"
+
+REQUEST_COUNT = Counter(
+    "http_requests_total",
+    "Total HTTP requests",
+    ["method", "path", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "path"],
+    buckets=settings.latency_buckets(),
+)
+ERROR_COUNT = Counter(
+    "http_request_errors_total",
+    "Total HTTP request errors",
+    ["method", "path", "status"],
+)
+
+
+def route_label(scope) -> str:
+    """Matched route template (e.g. ``/sessions/{id}``) rather than the raw path."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope:
+        # Mounted sub-app such as /static: label by its mount point
+        return scope.get("root_path") or UNMATCHED
+    return UNMATCHED
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; avoids BaseHTTPMiddleware's per-request task and
+    stream wrapping that ``@app.middleware("http")`` adds."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        method = scope["method"]
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            ERROR_COUNT.labels(method, route_label(scope), "500").inc()
+            raise
+        finally:
+            path = route_label(scope)
+            REQUEST_COUNT.labels(method, path, status).inc()
+            REQUEST_LATENCY.labels(method, path).observe(time.perf_counter() - start)
+
+
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time to check a connection out of the pool (incl. opening a new one)",
+)
+
+
+class PoolCollector:
+    """Reads pool occupancy from the tracked engines at scrape time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engines = {}
+
+    def track(self, name: str, engine) -> None:
+        with self._lock:
+            self._engines[name] = engine
+
+    def untrack(self, name: str, engine) -> None:
+        """Stop reporting ``engine``, unless another app has replaced it."""
+        with self._lock:
+            if name in self._engines and self._engines[name] is engine:
+                del self._engines[name]
+
+    def collect(self):
+        families = {
+            "size": GaugeMetricFamily(
+                "db_pool_size", "Configured pool size", labels=["pool"]
+            ),
+            "checkedout": GaugeMetricFamily(
+                "db_pool_checked_out", "Connections in use", labels=["pool"]
+            ),
+            "checkedin": GaugeMetricFamily(
+                "db_pool_checked_in", "Idle connections in the pool", labels=["pool"]
+            ),
+            "overflow": GaugeMetricFamily(
+                "db_pool_overflow",
+                "Connections beyond pool_size (negative: unopened slots)",
+                labels=["pool"],
+            ),
+        }
+        with self._lock:
+            engines = list(self._engines.items())
+        for name, engine in engines:
+            pool = engine.pool
+            # Only QueuePool-style pools (not in-memory SQLite's) keep counts
+            if not hasattr(pool, "checkedout"):
+                continue
+            for attr, family in families.items():
+                family.add_metric([name], getattr(pool, attr)())
+        return list(families.values())
+
+
+POOLS = PoolCollector()
+REGISTRY.register(POOLS)
+
+
+class TimedCheckout:
+    """Pool mixin recording each checkout's wait in ``db_pool_wait_seconds``."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start)
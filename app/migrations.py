@@ -0,0 +1,168 @@
+"""Minimal in-place schema upgrades for existing SQLite databases.
+
+``Base.metadata.create_all`` only creates missing tables, so changes to tables
+that already exist (new indexes, columns, ...) are applied here. Each step is
+idempotent so it is safe on a database freshly built by ``create_all`` too.
+The number of applied steps is tracked in SQLite's ``PRAGMA user_version``.
+
+Run against an existing file with::
+
+    python -m app.migrations sqlite:///./rehab.db
+"""
+import json
+import sys
+
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+
+
+def _columns(conn: Connection, table: str) -> set[str]:
+    """Column names of ``table``; empty if the table does not exist."""
+    return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+
+
+def _session_indexes(conn: Connection) -> None:
+    if not _columns(conn, "sessions"):
+        return
+    # Cover the (date desc, id desc) listing order, with and without an
+    # exercise_id filter, so list/page queries need no temp B-tree sort.
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_sessions_exercise_date_id "
+        "ON sessions (exercise_id, date, id)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_sessions_date_id ON sessions (date, id)"
+    )
+
+
+def _schedule_bitmask(conn: Connection) -> None:
+    # Replace the JSON text schedule_dow column with an integer bitmask
+    from .models import dow_to_mask
+
+    cols = _columns(conn, "exercises")
+    if not cols:
+        return
+    if "schedule_mask" not in cols:
+        conn.exec_driver_sql(
+            "ALTER TABLE exercises ADD COLUMN schedule_mask INTEGER NOT NULL DEFAULT 0"
+        )
+    if "schedule_dow" in cols:
+        rows = conn.exec_driver_sql("SELECT id, schedule_dow FROM exercises").all()
+        for ex_id, raw in rows:
+            days = [d for d in json.loads(raw or "[]") if 0 <= d <= 6]
+            conn.exec_driver_sql(
+                "UPDATE exercises SET schedule_mask = ? WHERE id = ?",
+                (dow_to_mask(days), ex_id),
+            )
+        conn.exec_driver_sql("ALTER TABLE exercises DROP COLUMN schedule_dow")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_exercises_schedule_mask "
+        "ON exercises (schedule_mask)"
+    )
+
+
+def _daily_rollups(conn: Connection) -> None:
+    # Backfill session_daily_rollup (created by create_all) from history
+    from .services.rollups import rebuild_rollups
+
+    if _columns(conn, "sessions") and _columns(conn, "session_daily_rollup"):
+        rebuild_rollups(conn)
+
+
+def _rebuild(conn: Connection, name: str) -> None:
+    """Recreate ``name`` with its current model definition, keeping the rows.
+
+    SQLite cannot alter a foreign key in place; this is its documented
+    create / copy / drop / rename sequence. Rows pointing at exercises that no
+    longer exist are dropped, as the new constraint would reject them.
+    """
+    from .database import Base
+
+    scratch = MetaData()
+    Base.metadata.tables["exercises"].to_metadata(scratch)
+    table = Base.metadata.tables[name]
+    new = table.to_metadata(scratch, name=f"{name}__new")
+    old_cols = _columns(conn, name)
+    cols = ", ".join(c.name for c in table.columns if c.name in old_cols)
+    where = ""
+    if _columns(conn, "exercises") and "exercise_id" in old_cols:
+        where = " WHERE exercise_id IN (SELECT id FROM exercises)"
+
+    conn.execute(CreateTable(new))
+    conn.exec_driver_sql(
+        f"INSERT INTO {new.name} ({cols}) SELECT {cols} FROM {name}{where}"
+    )
+    conn.exec_driver_sql(f"DROP TABLE {name}")
+    conn.exec_driver_sql(f"ALTER TABLE {new.name} RENAME TO {name}")
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def _cascade_exercise_deletes(conn: Connection) -> None:
+    # Let the database delete an exercise's sessions and rollups in one step
+    for name in ("sessions", "session_daily_rollup"):
+        if not _columns(conn, name):
+            continue
+        fks = conn.exec_driver_sql(f"PRAGMA foreign_key_list({name})").all()
+        # Rows are (id, seq, table, from, to, on_update, on_delete, match)
+        if not any(fk[2] == "exercises" and fk[6] == "CASCADE" for fk in fks):
+            _rebuild(conn, name)
+
+
+def _sessions_fts(conn: Connection) -> None:
+    # Full-text index over notes; create_all only adds it with a new table
+    from .services.search import reindex
+
+    if _columns(conn, "sessions"):
+        reindex(conn)
+
+
+MIGRATIONS = [
+    _session_indexes,
+    _schedule_bitmask,
+    _daily_rollups,
+    _cascade_exercise_deletes,
+    _sessions_fts,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_version(conn: Connection) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def run_migrations(engine: Engine) -> int:
+    """Apply any pending steps and return the resulting schema version."""
+    with engine.begin() as conn:
+        version = get_version(conn)
+        for step in MIGRATIONS[version:]:
+            step(conn)
+        if version < SCHEMA_VERSION:
+            conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return max(version, SCHEMA_VERSION)
+
+
+def ensure_schema(engine: Engine) -> int:
+    """Create missing tables and apply pending steps, unless already current.
+
+    An up-to-date database costs one ``PRAGMA user_version`` read, so worker
+    startup does not pay for ``create_all`` reflection on every spawn. New
+    tables therefore need a migration step too (bumping the version), not
+    just a model.
+    """
+    with engine.connect() as conn:
+        version = get_version(conn)
+    if version >= SCHEMA_VERSION:
+        return version
+    from . import models  # noqa: F401  (registers the tables)
+    from .database import Base
+
+    Base.metadata.create_all(bind=engine)
+    return run_migrations(engine)
+
+
+if __name__ == "__main__":
+    url = sys.argv[1] if len(sys.argv) > 1 else "sqlite:///./rehab.db"
+    print(f"{url}: schema version {run_migrations(create_engine(url))}")
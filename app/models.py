@@ -1,8 +1,35 @@
-from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, DateTime
+from sqlalchemy import (
+    DDL,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
 
+
+def dow_to_mask(days) -> int:
+    mask = 0
+    for d in days:
+        mask |= 1 << d
+    return mask
+
+
+def mask_to_dow(mask: int) -> list[int]:
+    return [d for d in range(7) if mask & (1 << d)]
+
+
+def masks_with_day(day: int) -> list[int]:
+    """Every weekday mask that includes ``day`` (64 of the 128 values)."""
+    return [m for m in range(128) if m & (1 << day)]
+
 class Exercise(Base):
     __tablename__ = "exercises"
 
@@ -24,22 +51,37 @@ class Exercise(Base):
     target_sets = Column(Integer, nullable=True)
     target_reps = Column(Integer, nullable=True)
     target_hold_sec = Column(Integer, nullable=True)
-    schedule_dow = Column(Text, nullable=False, default="[]")
+    # Bit d set = scheduled on weekday d (0=Sun, 1=Mon, ... 6=Sat)
+    schedule_mask = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        index=True,
+    )
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Sessions (and their rollups) are removed by the database's ON DELETE
+    # CASCADE; passive_deletes stops the ORM loading them just to delete them.
     sessions = relationship(
         "ExerciseSession",
         back_populates="exercise",
         cascade="all, delete",
+        passive_deletes=True,
     )
 
 class ExerciseSession(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Serve list_sessions' (date desc, id desc) order from an index
+        Index("ix_sessions_exercise_date_id", "exercise_id", "date", "id"),
+        Index("ix_sessions_date_id", "date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     exercise_id = Column(
         Integer,
-        ForeignKey("exercises.id"),
+        ForeignKey("exercises.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
@@ -53,3 +95,66 @@ class ExerciseSession(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     exercise = relationship("Exercise", back_populates="sessions")
+
+
+# Full-text index over sessions.notes. External content: the FTS5 table holds
+# only the index and reads text back from ``sessions``; the triggers keep it in
+# step with every write path (ORM, bulk inserts, cascaded deletes, raw SQL).
+SESSIONS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS sessions_fts USING fts5("
+    "notes, content='sessions', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS sessions_fts_ai AFTER INSERT ON sessions BEGIN "
+    "INSERT INTO sessions_fts (rowid, notes) VALUES (new.id, new.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS sessions_fts_ad AFTER DELETE ON sessions BEGIN "
+    "INSERT INTO sessions_fts (sessions_fts, rowid, notes) "
+    "VALUES ('delete', old.id, old.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS sessions_fts_au AFTER UPDATE OF notes "
+    "ON sessions BEGIN "
+    "INSERT INTO sessions_fts (sessions_fts, rowid, notes) "
+    "VALUES ('delete', old.id, old.notes); "
+    "INSERT INTO sessions_fts (rowid, notes) VALUES (new.id, new.notes); END",
+)
+
+for _ddl in SESSIONS_FTS_DDL:
+    event.listen(
+        ExerciseSession.__table__,
+        "after_create",
+        DDL(_ddl).execute_if(dialect="sqlite"),
+    )
+
+
+class SessionDailyRollup(Base):
+    """Per exercise and day totals of ``sessions``.
+
+    Kept in step with ``sessions`` inside the writing transaction (see
+    ``app.services.rollups``) so progress views read O(days) rows.
+    """
+    __tablename__ = "session_daily_rollup"
+
+    exercise_id = Column(
+        Integer,
+        ForeignKey("exercises.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date = Column(Date, primary_key=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    pain_sum = Column(Integer, nullable=False, default=0)
+    pain_count = Column(Integer, nullable=False, default=0)
+    pain_min = Column(Integer, nullable=True)
+    pain_max = Column(Integer, nullable=True)
+    rom_max = Column(Integer, nullable=True)
+    # Sum of sets x reps (missing values count as 0)
+    volume = Column(Integer, nullable=False, default=0)
+
+
+class TableVersion(Base):
+    """Per-table change counter, bumped in the same transaction as each write.
+
+    Lets in-process caches in any worker detect stale entries with a single
+    primary-key lookup.
+    """
+    __tablename__ = "table_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
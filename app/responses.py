@@ -0,0 +1,27 @@
+"""Fast JSON responses for trusted, already-validated data.
+
+Returning a Response instance makes FastAPI skip ``response_model``
+validation, so these are only used for rows read straight from the database
+(validated when they were written) and for cached serialized output.
+"""
+import orjson
+from fastapi import Response
+
+
+def json_response(
+    content=None,
+    *,
+    body: bytes | None = None,
+    headers_from: Response | None = None,
+) -> Response:
+    """Encode ``content`` with orjson (or send pre-encoded ``body``).
+
+    ``headers_from`` is the route's injected Response; FastAPI only merges its
+    headers (ETag, Cache-Control, ...) into responses it builds itself.
+    """
+    if body is None:
+        body = orjson.dumps(content)
+    resp = Response(content=body, media_type="application/json")
+    if headers_from is not None:
+        resp.headers.raw.extend(headers_from.headers.raw)
+    return resp
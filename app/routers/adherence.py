@@ -0,0 +1,35 @@
+from datetime import date, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..responses import json_response
+from .. import schemas
+
+router = APIRouter(prefix="/adherence", tags=["adherence"])
+
+DEFAULT_DAYS = 28
+# The report holds an exercises x days matrix, so the span is bounded
+MAX_DAYS = 3 * 366
+
+
+@router.get("", response_model=schemas.AdherenceReport)
+def adherence(
+    db: Session = Depends(get_db),
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+):
+    """Scheduled vs logged days per exercise and overall (default: last 4 weeks)."""
+    from ..services import adherence as adherence_service  # numpy: import on use
+
+    to_date = to_date or date.today()
+    from_date = from_date or to_date - timedelta(days=DEFAULT_DAYS - 1)
+    if from_date > to_date:
+        raise HTTPException(status_code=400, detail="'from' is after 'to'")
+    if (to_date - from_date).days >= MAX_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Range is longer than {MAX_DAYS} days"
+        )
+    return json_response(
+        body=adherence_service.adherence_report(db, from_date, to_date)
+    )
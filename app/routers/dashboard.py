@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+from ..conditional import conditional
+from ..database import get_db
+from ..events import bus
+from ..responses import json_response
+from .. import schemas
+from ..services import dashboard as dashboard_service
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("", response_model=schemas.Dashboard)
+def dashboard(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    limit: int = Query(default=50, ge=1, le=1000),
+):
+    """Exercises, recent sessions, category counts and chart data in one call.
+
+    ``X-Last-Event-Id`` is the change feed position the data is at least as
+    new as; pass it to ``/events?since=`` to receive every later change.
+    """
+    # Taken before the read, so replaying from it can only repeat changes
+    last_event_id = bus.last_id
+    version = dashboard_service.versions(db)
+    etag = '"dashboard-v{}"'.format(".".join(map(str, version)))
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        # Browsers update the stored response's headers from a 304
+        not_modified.headers["X-Last-Event-Id"] = last_event_id
+        return not_modified
+    response.headers["X-Last-Event-Id"] = last_event_id
+    return json_response(
+        body=dashboard_service.dashboard(db, limit, version),
+        headers_from=response,
+    )
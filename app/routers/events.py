@@ -0,0 +1,53 @@
+import asyncio
+
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+from ..events import Event, bus
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# A comment line this often keeps proxies from closing an idle stream
+KEEPALIVE_S = 15.0
+# Browser reconnect delay after the stream drops
+RETRY_MS = 3000
+
+
+async def _stream(last_event_id: str | None):
+    queue, backlog, current_id = bus.subscribe(last_event_id)
+    try:
+        yield b"retry: %d\n\n" % RETRY_MS
+        if backlog is None:
+            # Missed events are gone; the client reloads and continues from here
+            yield Event(current_id, "reset", b"{}").encode()
+            backlog = []
+        for event in backlog:
+            yield event.encode()
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), KEEPALIVE_S)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if event is None:
+                # Fell too far behind; the reconnect resumes via Last-Event-ID
+                return
+            yield event.encode()
+    finally:
+        bus.unsubscribe(queue)
+
+
+@router.get("")
+async def events(
+    last_event_id: str | None = Header(default=None),
+    since: str | None = Query(default=None),
+):
+    """Server-Sent Events feed of exercise and session changes.
+
+    Resumes after ``Last-Event-ID`` (sent by browsers on reconnect) or
+    ``?since=``, e.g. the ``X-Last-Event-Id`` of a /dashboard response.
+    """
+    return StreamingResponse(
+        _stream(last_event_id or since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
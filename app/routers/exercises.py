@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
+from ..conditional import conditional, table_etag
 from ..database import get_db
+from ..responses import json_response
 from .. import schemas
 from ..services import exercises as exercise_service
 
@@ -16,12 +20,57 @@ def create_exercise(payload: schemas.ExerciseCreate, db: Session = Depends(get_d
     "",
     response_model=list[schemas.ExerciseOut],
 )
-def list_exercises(db: Session = Depends(get_db)):
-    return exercise_service.list_exercises(db)
+def list_exercises(
+    request: Request, response: Response, db: Session = Depends(get_db)
+):
+    not_modified = conditional(request, response, table_etag(db, "exercises"))
+    if not_modified:
+        return not_modified
+    return json_response(
+        body=exercise_service.catalog(db).json, headers_from=response
+    )
+
+
+@router.get("/due", response_model=list[schemas.ExerciseOut])
+def list_due_exercises(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    day: date | None = Query(default=None, alias="date"),
+):
+    day = day or date.today()
+    # Without ?date= the answer changes at midnight, not only with the table
+    etag = table_etag(db, "exercises")
+    not_modified = conditional(request, response, f'{etag[:-1]}-{day.isoformat()}"')
+    if not_modified:
+        return not_modified
+    return exercise_service.list_due_exercises(db, day)
+
+
+@router.get("/progress", response_model=list[schemas.ExerciseProgress])
+def all_progress(
+    db: Session = Depends(get_db),
+    from_date: date = Query(default=None),
+    to_date: date = Query(default=None),
+):
+    """Progress for every exercise, computed from one pass over sessions."""
+    from ..services import progress as progress_service  # numpy: import on use
+
+    return json_response(
+        progress_service.all_progress(db, from_date, to_date)
+    )
 
 
 @router.get("/{exercise_id}", response_model=schemas.ExerciseOut)
-def get_exercise(exercise_id: int, db: Session = Depends(get_db)):
+def get_exercise(
+    exercise_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    not_modified = conditional(request, response, table_etag(db, "exercises"))
+    if not_modified:
+        return not_modified
     out = exercise_service.get_exercise(db, exercise_id)
     if not out:
         raise HTTPException(status_code=404, detail="Exercise not found")
@@ -45,3 +94,20 @@ def delete_exercise(exercise_id: int, db: Session = Depends(get_db)):
     ok = exercise_service.delete_exercise(db, exercise_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Exercise not found")
+
+
+@router.get(
+    "/{exercise_id}/progress", response_model=schemas.ExerciseProgress
+)
+def exercise_progress(
+    exercise_id: int,
+    db: Session = Depends(get_db),
+    from_date: date = Query(default=None),
+    to_date: date = Query(default=None),
+):
+    from ..services import progress as progress_service  # numpy: import on use
+
+    out = progress_service.exercise_progress(db, exercise_id, from_date, to_date)
+    if out is None:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    return json_response(out)
@@ -0,0 +1,73 @@
+"""Async-mode exercise routes (enabled with DB_ASYNC=true).
+
+Registered ahead of the sync router; paths not defined here fall through
+to ``app.routers.exercises``.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..conditional import conditional, table_etag
+from ..database import get_async_db
+from ..responses import json_response
+from .. import schemas
+from ..services import exercises as exercise_catalog
+from ..services import exercises_async as exercise_service
+
+router = APIRouter(prefix="/exercises", tags=["exercises"])
+
+
+@router.post("", response_model=schemas.ExerciseOut)
+async def create_exercise(
+    payload: schemas.ExerciseCreate, db: AsyncSession = Depends(get_async_db)
+):
+    return await exercise_service.create_exercise(db, payload)
+
+
+@router.get(
+    "",
+    response_model=list[schemas.ExerciseOut],
+)
+async def list_exercises(
+    request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+):
+    etag = await db.run_sync(table_etag, "exercises")
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    cached = await db.run_sync(exercise_catalog.catalog)
+    return json_response(body=cached.json, headers_from=response)
+
+
+@router.get("/{exercise_id:int}", response_model=schemas.ExerciseOut)
+async def get_exercise(
+    exercise_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    etag = await db.run_sync(table_etag, "exercises")
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    out = await exercise_service.get_exercise(db, exercise_id)
+    if not out:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    return out
+
+
+@router.put("/{exercise_id:int}", response_model=schemas.ExerciseOut)
+async def update_exercise(
+    exercise_id: int,
+    payload: schemas.ExerciseUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    out = await exercise_service.update_exercise(db, exercise_id, payload)
+    if not out:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    return out
+
+
+@router.delete("/{exercise_id:int}", status_code=204)
+async def delete_exercise(exercise_id: int, db: AsyncSession = Depends(get_async_db)):
+    ok = await exercise_service.delete_exercise(db, exercise_id)
+    if not ok:
+        raise HTTPException(status_code=404, detail="Exercise not found")
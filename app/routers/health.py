@@ -1,12 +1,49 @@
-from fastapi import APIRouter, Depends, Response
+import threading
+import time
+import weakref
+
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
+from .. import database
+from ..config import settings
 from ..database import get_db
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
 router = APIRouter(prefix="", tags=["health"])
 
 
+class CachedCheck:
+    """Runs an engine's ``SELECT 1`` at most once per ``ttl`` seconds.
+
+    Probes arriving while a check is in flight wait for it instead of
+    starting their own, so probe rate never turns into pool load.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # engine -> (monotonic time of the check, result)
+        self._results = weakref.WeakKeyDictionary()
+
+    def __call__(self, engine, ttl: float) -> bool:
+        with self._lock:
+            checked = self._results.get(engine)
+            if checked and time.monotonic() - checked[0] < ttl:
+                return checked[1]
+            try:
+                with engine.connect() as conn:
+                    conn.exec_driver_sql("SELECT 1")
+                ok = True
+            except Exception:
+                ok = False
+            self._results[engine] = (time.monotonic(), ok)
+            return ok
+
+
+db_ready = CachedCheck()
+
+
 @router.get("/health")
 def health(db: Session = Depends(get_db)):
     """Return basic health status and check DB with a simple query."""
@@ -18,6 +55,22 @@ def health(db: Session = Depends(get_db)):
         return {"status": "ok", "db": "error"}
 
 
+@router.get("/livez")
+def livez():
+    """Liveness: the process is serving requests. Never touches the database."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+def readyz(request: Request):
+    """Readiness: the database answers; the result is reused for a short TTL."""
+    cfg = getattr(request.app.state, "settings", settings)
+    engine = getattr(request.app.state, "engine", None) or database.engine
+    if db_ready(engine, cfg.readiness_ttl_s):
+        return {"status": "ready", "db": "ok"}
+    return JSONResponse({"status": "not ready", "db": "error"}, status_code=503)
+
+
 @router.get("/metrics")
 def metrics() -> Response:
     """Expose Prometheus metrics in text format."""
@@ -1,16 +1,138 @@
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import csv
+import io
+import json
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from datetime import date
+from ..conditional import conditional, table_etag
 from ..database import get_db
+from ..responses import json_response
 from .. import schemas
+from ..services import exercises as exercise_service
+from ..services import rollups as rollup_service
+from ..services import search as search_service
 from ..services import sessions as session_service
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
+MAX_BULK_ROWS = 10_000
+
+
+# Static paths must be registered before "/{id}" so they are not captured by it
+@router.get("/series", response_model=list[schemas.SeriesPoint])
+def session_series(
+    db: Session = Depends(get_db),
+    bucket: schemas.Bucket = Query(default="day"),
+    from_date: date = Query(default=None),
+    to_date: date = Query(default=None),
+    exercise_id: int | None = Query(default=None),
+):
+    return session_service.session_series(
+        db, bucket, from_date, to_date, exercise_id
+    )
+
+
+@router.get("/daily", response_model=list[schemas.DailyRollupOut])
+def daily_rollups(
+    db: Session = Depends(get_db),
+    from_date: date = Query(default=None),
+    to_date: date = Query(default=None),
+    exercise_id: int | None = Query(default=None),
+    by_exercise: bool = Query(default=True),
+):
+    """Per-day session totals read from the rollup table."""
+    return rollup_service.daily_rollups(
+        db, from_date, to_date, exercise_id, by_exercise
+    )
+
+
+@router.get("/search", response_model=schemas.SearchPage)
+def search_sessions(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    q: str = Query(min_length=1, max_length=200),
+    from_date: date = Query(default=None),
+    to_date: date = Query(default=None),
+    exercise_id: int | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+):
+    """Ranked full-text search over session notes."""
+    not_modified = conditional(request, response, table_etag(db, "sessions"))
+    if not_modified:
+        return not_modified
+    items, next_offset = search_service.search_sessions(
+        db, q, from_date, to_date, exercise_id, limit, offset
+    )
+    return json_response(
+        {"items": items, "next_offset": next_offset}, headers_from=response
+    )
+
+
+def _csv_chunks(rows, chunk_rows=500):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(session_service.EXPORT_COLUMNS)
+    for n, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if n % chunk_rows == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        record = dict(zip(session_service.EXPORT_COLUMNS, row))
+        record["date"] = record["date"].isoformat()
+        yield json.dumps(record) + "\n"
+
+
+@router.get("/export")
+def export_sessions(
+    db: Session = Depends(get_db),
+    fmt: Literal["csv", "ndjson"] = Query(default="csv", alias="format"),
+    from_date: date = Query(default=None),
+    to_date: date = Query(default=None),
+    exercise_id: int | None = Query(default=None),
+):
+    """Stream the filtered session history as CSV or NDJSON."""
+
+    def rows():
+        # The get_db cleanup runs before the body is streamed, so the
+        # generator closes the session itself once the cursor is drained.
+        try:
+            yield from session_service.iter_session_rows(
+                db, from_date, to_date, exercise_id
+            )
+        finally:
+            db.close()
+
+    if fmt == "ndjson":
+        body, media_type = _ndjson_lines(rows()), "application/x-ndjson"
+    else:
+        body, media_type = _csv_chunks(rows()), "text/csv"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="sessions.{fmt}"'},
+    )
+
 
 @router.get("/{id}", response_model=schemas.SessionOut)
-def get_session(id: int, db: Session = Depends(get_db)):
+def get_session(
+    id: int, request: Request, response: Response, db: Session = Depends(get_db)
+):
+    not_modified = conditional(request, response, table_etag(db, "sessions"))
+    if not_modified:
+        return not_modified
     s = session_service.get_session(db, id)
     if not s:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -23,6 +145,11 @@ def update_session(
     payload: schemas.SessionUpdate,
     db: Session = Depends(get_db),
 ):
+    # The foreign key would reject it; answer like create does instead
+    if payload.exercise_id is not None and not exercise_service.get_exercise(
+        db, payload.exercise_id
+    ):
+        raise HTTPException(status_code=400, detail="Exercise does not exist")
     s = session_service.update_session(db, id, payload)
     if not s:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -37,21 +164,85 @@ def delete_session(id: int, db: Session = Depends(get_db)):
 
 
 @router.post("", response_model=schemas.SessionOut)
-def create_session(payload: schemas.SessionCreate, db: Session = Depends(get_db)):
-    s = session_service.create_session(db, payload)
+async def create_session(
+    payload: schemas.SessionCreate, request: Request, db: Session = Depends(get_db)
+):
+    # Async so a request waiting for its group commit does not hold one of the
+    # threadpool's threads, which would cap batches at the pool size
+    writer = getattr(request.app.state, "session_writer", None)
+    if writer is not None:
+        s = await writer.create_session_async(payload)
+    else:
+        s = await run_in_threadpool(session_service.create_session, db, payload)
     if not s:
         raise HTTPException(status_code=400, detail="Exercise does not exist")
     return s
 
 
+@router.post("/bulk", response_model=schemas.BulkSessionResponse)
+async def create_sessions_bulk(request: Request, db: Session = Depends(get_db)):
+    """Create many sessions from a JSON array or an NDJSON body."""
+    body = await request.body()
+    try:
+        if "ndjson" in request.headers.get("content-type", ""):
+            raw_rows = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            raw_rows = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Malformed JSON body")
+    if not isinstance(raw_rows, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array")
+    if len(raw_rows) > MAX_BULK_ROWS:
+        raise HTTPException(status_code=413, detail="Too many rows")
+
+    results = [schemas.BulkSessionResult(index=i) for i in range(len(raw_rows))]
+    valid: list[tuple[int, schemas.SessionCreate]] = []
+    for i, raw in enumerate(raw_rows):
+        try:
+            valid.append((i, schemas.SessionCreate.model_validate(raw)))
+        except ValidationError as exc:
+            results[i].error = str(exc.errors(include_url=False))
+    ids = await run_in_threadpool(
+        session_service.create_sessions_bulk, db, [p for _, p in valid]
+    )
+    for (i, _), new_id in zip(valid, ids):
+        if new_id is None:
+            results[i].error = "Exercise does not exist"
+        else:
+            results[i].id = new_id
+    created = sum(1 for r in results if r.id is not None)
+    return schemas.BulkSessionResponse(
+        created=created, failed=len(results) - created, results=results
+    )
+
+
 @router.get(
     "",
-    response_model=list[schemas.SessionOut],
+    response_model=list[schemas.SessionOut] | schemas.SessionPage,
 )
 def list_sessions(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     from_date: date = Query(default=None),
     to_date: date = Query(default=None),
     exercise_id: int | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
 ):
-    return session_service.list_sessions(db, from_date, to_date, exercise_id)
+    not_modified = conditional(request, response, table_etag(db, "sessions"))
+    if not_modified:
+        return not_modified
+    # Without a limit keep returning the full list for existing clients
+    if limit is None and cursor is None:
+        rows = session_service.list_session_rows(db, from_date, to_date, exercise_id)
+        return json_response(rows, headers_from=response)
+    try:
+        items, next_cursor = session_service.list_sessions_page(
+            db, from_date, to_date, exercise_id, limit or 100, cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return json_response(
+        {"items": items, "next_cursor": next_cursor}, headers_from=response
+    )
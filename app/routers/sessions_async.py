@@ -0,0 +1,108 @@
+"""Async-mode session routes (enabled with DB_ASYNC=true).
+
+Registered ahead of the sync router. ``{id:int}`` keeps static paths such as
+``/sessions/series`` from matching here so they fall through to
+``app.routers.sessions``.
+"""
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..conditional import conditional, table_etag
+from ..database import get_async_db
+from ..responses import json_response
+from .. import schemas
+from ..services import exercises as exercise_service
+from ..services import sessions_async as session_service
+
+router = APIRouter(prefix="/sessions", tags=["sessions"])
+
+
+@router.get("/{id:int}", response_model=schemas.SessionOut)
+async def get_session(
+    id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    etag = await db.run_sync(table_etag, "sessions")
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    s = await session_service.get_session(db, id)
+    if not s:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return s
+
+
+@router.put("/{id:int}", response_model=schemas.SessionOut)
+async def update_session(
+    id: int,
+    payload: schemas.SessionUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    if payload.exercise_id is not None and not await db.run_sync(
+        exercise_service.get_exercise, payload.exercise_id
+    ):
+        raise HTTPException(status_code=400, detail="Exercise does not exist")
+    s = await session_service.update_session(db, id, payload)
+    if not s:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return s
+
+
+@router.delete("/{id:int}", status_code=204)
+async def delete_session(id: int, db: AsyncSession = Depends(get_async_db)):
+    ok = await session_service.delete_session(db, id)
+    if not ok:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+
+@router.post("", response_model=schemas.SessionOut)
+async def create_session(
+    payload: schemas.SessionCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    writer = getattr(request.app.state, "session_writer", None)
+    if writer is not None:
+        s = await writer.create_session_async(payload)
+    else:
+        s = await session_service.create_session(db, payload)
+    if not s:
+        raise HTTPException(status_code=400, detail="Exercise does not exist")
+    return s
+
+
+@router.get(
+    "",
+    response_model=list[schemas.SessionOut] | schemas.SessionPage,
+)
+async def list_sessions(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    from_date: date = Query(default=None),
+    to_date: date = Query(default=None),
+    exercise_id: int | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+):
+    etag = await db.run_sync(table_etag, "sessions")
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    if limit is None and cursor is None:
+        rows = await session_service.list_session_rows(
+            db, from_date, to_date, exercise_id
+        )
+        return json_response(rows, headers_from=response)
+    try:
+        items, next_cursor = await session_service.list_sessions_page(
+            db, from_date, to_date, exercise_id, limit or 100, cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return json_response(
+        {"items": items, "next_cursor": next_cursor}, headers_from=response
+    )
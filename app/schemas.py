@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-from typing import Optional, List, Literal
+import datetime
+from typing import Dict, Optional, List, Literal
 from datetime import date
 
-from pydantic import BaseModel, Field, conint
+from pydantic import BaseModel, Field, conint, constr
 
 PainInt = Optional[conint(ge=0, le=10)]
+# 0=Sun, 1=Mon, ... 6=Sat
+Weekday = conint(ge=0, le=6)
 ROMInt = Optional[conint(ge=0, le=180)]
+Notes = Optional[constr(max_length=2000)]
 
 Side = Literal["left", "right", "both"]
 Category = Literal["strength", "mobility", "balance"]
+Bucket = Literal["day", "week", "month"]
 
 class ExerciseBase(BaseModel):
     name: str = Field(min_length=2, max_length=120)
@@ -18,8 +23,7 @@ class ExerciseBase(BaseModel):
     target_sets: Optional[int] = None
     target_reps: Optional[int] = None
     target_hold_sec: Optional[int] = None
-    # 0=Sun, 1=Mon, ... 6=Sat
-    schedule_dow: List[int] = Field(default_factory=list)  
+    schedule_dow: List[Weekday] = Field(default_factory=list)
 
 class ExerciseCreate(ExerciseBase):
     pass
@@ -31,7 +35,7 @@ class ExerciseUpdate(BaseModel):
     target_sets: Optional[int] = None
     target_reps: Optional[int] = None
     target_hold_sec: Optional[int] = None
-    schedule_dow: Optional[List[int]] = None
+    schedule_dow: Optional[List[Weekday]] = None
 
 class ExerciseOut(ExerciseBase):
     id: int
@@ -46,14 +50,17 @@ class SessionBase(BaseModel):
     hold_sec: Optional[int] = None
     pain_0_10: PainInt = None
     rom_deg: ROMInt = None
+    notes: Notes = None
 class SessionUpdate(BaseModel):
     exercise_id: Optional[int] = None
-    date: Optional[date] = None
+    # Qualified: a bare ``date`` here would resolve to this field's default
+    date: Optional[datetime.date] = None
     sets: Optional[int] = None
     reps: Optional[int] = None
     hold_sec: Optional[int] = None
     pain_0_10: PainInt = None
     rom_deg: ROMInt = None
+    notes: Notes = None
 
 class SessionCreate(SessionBase):
     pass
@@ -62,3 +69,123 @@ class SessionOut(SessionBase):
     id: int
     class Config:
         from_attributes = True
+
+class SessionPage(BaseModel):
+    items: List[SessionOut]
+    # Pass back as ?cursor= to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class SearchHit(SessionOut):
+    # Negated bm25 relevance: higher is a better match
+    score: float
+    # Matching part of the notes with hits wrapped in [ ]
+    snippet: Optional[str] = None
+
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    # Pass back as ?offset= for the next page; None on the last page
+    next_offset: Optional[int] = None
+
+
+class SeriesPoint(BaseModel):
+    exercise_id: int
+    # First day of the bucket (the Monday for weekly buckets)
+    bucket: date
+    count: int
+    pain_mean: Optional[float] = None
+    pain_min: Optional[int] = None
+    pain_max: Optional[int] = None
+    rom_mean: Optional[float] = None
+    rom_min: Optional[int] = None
+    rom_max: Optional[int] = None
+
+
+class BulkSessionResult(BaseModel):
+    # Position of the row in the submitted array / NDJSON stream
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkSessionResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkSessionResult]
+
+
+class DailyRollupOut(BaseModel):
+    # None when exercises are combined into one row per day
+    exercise_id: Optional[int] = None
+    date: date
+    session_count: int
+    pain_mean: Optional[float] = None
+    pain_min: Optional[int] = None
+    pain_max: Optional[int] = None
+    rom_max: Optional[int] = None
+    volume: int
+
+
+class ProgressPoint(BaseModel):
+    date: date
+    # Mean of the day's sessions, then means over the trailing 7 / 28 days
+    rom_mean: Optional[float] = None
+    rom_7d: Optional[float] = None
+    rom_28d: Optional[float] = None
+    # 7-day mean minus the 7-day mean one week earlier
+    rom_wow: Optional[float] = None
+    pain_mean: Optional[float] = None
+    pain_7d: Optional[float] = None
+    pain_28d: Optional[float] = None
+    pain_wow: Optional[float] = None
+
+
+class ExerciseProgress(BaseModel):
+    exercise_id: int
+    sessions: int
+    first_date: Optional[date] = None
+    last_date: Optional[date] = None
+    # Linear-regression trend over the whole range, per week
+    rom_slope_per_week: Optional[float] = None
+    pain_slope_per_week: Optional[float] = None
+    # rom_wow / pain_wow of the last session day
+    rom_wow_delta: Optional[float] = None
+    pain_wow_delta: Optional[float] = None
+    points: List[ProgressPoint]
+
+
+class ExerciseAdherence(BaseModel):
+    exercise_id: int
+    name: str
+    scheduled_days: int
+    completed_days: int
+    # completed / scheduled; None when nothing was scheduled in range
+    adherence: Optional[float] = None
+    # Runs of consecutive scheduled days with a session; current ends at the
+    # last scheduled day in range
+    current_streak: int
+    longest_streak: int
+
+
+class AdherenceReport(BaseModel):
+    from_date: date
+    to_date: date
+    scheduled_days: int
+    completed_days: int
+    adherence: Optional[float] = None
+    # Over days with anything scheduled, counting days where all of it was done
+    current_streak: int
+    longest_streak: int
+    exercises: List[ExerciseAdherence]
+
+
+class Dashboard(BaseModel):
+    exercises: List[ExerciseOut]
+    # Newest first; ``session_count`` is the total across the whole history
+    recent_sessions: List[SessionOut]
+    session_count: int
+    # Number of exercises per category, including empty categories
+    categories: Dict[Category, int]
+    # One row per exercise and day, oldest first, for the pain chart
+    daily: List[DailyRollupOut]
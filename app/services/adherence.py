@@ -0,0 +1,110 @@
+"""Adherence: share of scheduled exercise days that have a logged session.
+
+Schedules (weekday masks) are expanded into an exercises x days boolean
+matrix with NumPy and matched against the distinct (exercise, day) pairs in
+``session_daily_rollup``, so the cost grows with days in range, not sessions.
+Days before an exercise was created are not scheduled for it.
+"""
+from datetime import date
+
+import numpy as np
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from .. import models
+from ..cache import VersionedCache
+
+# One encoded report per (from, to); schedules live on exercises, completions
+# on sessions, so a write to either table invalidates every range.
+_reports = VersionedCache("adherence", ("sessions", "exercises"))
+
+
+def _ratio(done: int, scheduled: int) -> float | None:
+    return round(done / scheduled, 4) if scheduled else None
+
+
+def _streaks(flags) -> tuple[int, int]:
+    """(current, longest) run of True in a 1-D bool array; current ends it."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], flags, [0]))))
+    lengths = edges[1::2] - edges[::2]
+    if not lengths.size:
+        return 0, 0
+    current = int(lengths[-1]) if edges[-1] == flags.size else 0
+    return current, int(lengths.max())
+
+
+def _report(db: Session, from_date: date, to_date: date) -> dict:
+    exercises = db.execute(
+        select(
+            models.Exercise.id,
+            models.Exercise.name,
+            models.Exercise.schedule_mask,
+            models.Exercise.created_at,
+        ).order_by(models.Exercise.id)
+    ).all()
+    first = from_date.toordinal()
+    n_days = max(to_date.toordinal() - first + 1, 0)
+    # date.toordinal() is 1 for a Monday, so ordinal % 7 is 0=Sun ... 6=Sat,
+    # matching the schedule mask bits
+    dow = (first + np.arange(n_days)) % 7
+    masks = np.array([e.schedule_mask or 0 for e in exercises], dtype=np.int64)
+    scheduled = ((masks[:, None] >> dow[None, :]) & 1).astype(bool)
+    starts = np.array(
+        [e.created_at.toordinal() - first if e.created_at else 0 for e in exercises],
+        dtype=np.int64,
+    )
+    scheduled &= np.arange(n_days)[None, :] >= starts[:, None]
+
+    row_of = {e.id: i for i, e in enumerate(exercises)}
+    _R = models.SessionDailyRollup
+    logged = db.execute(
+        select(_R.exercise_id, _R.date).where(
+            _R.date >= from_date, _R.date <= to_date
+        )
+    ).all()
+    logged = [(row_of[ex_id], d) for ex_id, d in logged if ex_id in row_of]
+    done = np.zeros_like(scheduled)
+    if logged:
+        rows = np.array([r for r, _ in logged])
+        cols = np.array([d.toordinal() - first for _, d in logged])
+        done[rows, cols] = True
+    hit = scheduled & done
+
+    per_exercise = []
+    for i, e in enumerate(exercises):
+        current, longest = _streaks(hit[i][scheduled[i]])
+        n_sched, n_done = int(scheduled[i].sum()), int(hit[i].sum())
+        per_exercise.append({
+            "exercise_id": e.id,
+            "name": e.name,
+            "scheduled_days": n_sched,
+            "completed_days": n_done,
+            "adherence": _ratio(n_done, n_sched),
+            "current_streak": current,
+            "longest_streak": longest,
+        })
+
+    # Overall streaks count days on which every scheduled exercise was done
+    any_scheduled = scheduled.any(axis=0)
+    all_done = ~(scheduled & ~done).any(axis=0)
+    current, longest = _streaks(all_done[any_scheduled])
+    total_sched, total_done = int(scheduled.sum()), int(hit.sum())
+    return {
+        "from_date": from_date,
+        "to_date": to_date,
+        "scheduled_days": total_sched,
+        "completed_days": total_done,
+        "adherence": _ratio(total_done, total_sched),
+        "current_streak": current,
+        "longest_streak": longest,
+        "exercises": per_exercise,
+    }
+
+
+def adherence_report(db: Session, from_date: date, to_date: date) -> bytes:
+    """Encoded adherence report for the inclusive range, cached per range."""
+    return _reports.get_or_load(
+        db,
+        lambda db: orjson.dumps(_report(db, from_date, to_date)),
+        key=(from_date, to_date),
+    )
@@ -0,0 +1,56 @@
+"""Everything the UI needs on load, assembled in one request.
+
+With the table counters read once up front, a cached response costs that one
+query; a rebuild adds one query each for recent sessions and the daily
+rollups (the exercise catalog has its own cache).
+"""
+from typing import get_args
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from .. import schemas
+from ..cache import VersionedCache, get_versions
+from . import exercises as exercise_service
+from .rollups import all_rollup_dicts
+from .sessions import SESSION_ORDER, SESSION_OUT_COLUMNS
+
+TABLES = ("exercises", "sessions")
+
+# One encoded body per ``limit``
+_dashboards = VersionedCache("dashboard", TABLES)
+
+
+def versions(db: Session) -> tuple[int, ...]:
+    """Counters of TABLES; pass them on to ``dashboard`` and the ETag."""
+    return get_versions(db, TABLES)
+
+
+def _dashboard(db: Session, limit: int, version: tuple[int, ...]) -> bytes:
+    catalog = exercise_service.catalog(db, version[0])
+    recent = db.execute(
+        select(*SESSION_OUT_COLUMNS).order_by(*SESSION_ORDER).limit(limit)
+    )
+    daily = all_rollup_dicts(db)
+    categories = dict.fromkeys(get_args(schemas.Category), 0)
+    for ex in catalog.items:
+        categories[ex.category] += 1
+    return orjson.dumps({
+        "exercises": [ex.model_dump() for ex in catalog.items],
+        "recent_sessions": [row._asdict() for row in recent],
+        # The rollups cover every session, so no separate COUNT(*)
+        "session_count": sum(d["session_count"] for d in daily),
+        "categories": categories,
+        "daily": daily,
+    })
+
+
+def dashboard(db: Session, limit: int = 50, version=None) -> bytes:
+    """Encoded Dashboard with the newest ``limit`` sessions, cached per limit."""
+    version = version or versions(db)
+    return _dashboards.get_or_load(
+        db,
+        lambda db: _dashboard(db, limit, version),
+        key=limit,
+        version=version,
+    )
@@ -1,69 +1,105 @@
-import json
+from datetime import date
+from typing import NamedTuple
+
+import orjson
 from sqlalchemy.orm import Session
 from .. import models
 from .. import schemas
+from ..cache import VersionedCache, bump_version
+from ..events import publish
 
+# Serialized catalog (list + by-id map); the table is tiny and read on every
+# UI render, so it is rebuilt only when the "exercises" version changes.
+_catalog = VersionedCache("exercise_catalog", "exercises")
 
-def create_exercise(
-    db: Session, payload: schemas.ExerciseCreate
-) -> schemas.ExerciseOut:
-    ex = models.Exercise(
+
+class Catalog(NamedTuple):
+    items: list[schemas.ExerciseOut]
+    by_id: dict[int, schemas.ExerciseOut]
+    # Pre-encoded JSON of ``items`` so cache hits skip serialization entirely
+    json: bytes
+
+
+def exercise_out(ex: models.Exercise) -> schemas.ExerciseOut:
+    return schemas.ExerciseOut(
+        id=ex.id,
+        name=ex.name,
+        side=ex.side,
+        category=ex.category,
+        target_sets=ex.target_sets,
+        target_reps=ex.target_reps,
+        target_hold_sec=ex.target_hold_sec,
+        schedule_dow=models.mask_to_dow(ex.schedule_mask or 0),
+    )
+
+
+def new_exercise(payload: schemas.ExerciseCreate) -> models.Exercise:
+    return models.Exercise(
         name=payload.name,
         side=payload.side,
         category=payload.category,
         target_sets=payload.target_sets,
         target_reps=payload.target_reps,
         target_hold_sec=payload.target_hold_sec,
-        schedule_dow=json.dumps(payload.schedule_dow or []),
+        schedule_mask=models.dow_to_mask(payload.schedule_dow or []),
+    )
+
+
+def apply_update(ex: models.Exercise, payload: schemas.ExerciseUpdate) -> None:
+    data = payload.model_dump(exclude_unset=True)
+    for field, value in data.items():
+        if field == "schedule_dow":
+            ex.schedule_mask = models.dow_to_mask(value or [])
+        else:
+            setattr(ex, field, value)
+
+
+def _load_catalog(db: Session) -> Catalog:
+    items = db.query(models.Exercise).order_by(models.Exercise.id).all()
+    result = [exercise_out(ex) for ex in items]
+    return Catalog(
+        items=result,
+        by_id={ex.id: ex for ex in result},
+        json=orjson.dumps([ex.model_dump() for ex in result]),
+    )
+
+
+def catalog(db: Session, version: int | None = None) -> Catalog:
+    """``version`` is the "exercises" counter if the caller already read it."""
+    return _catalog.get_or_load(
+        db, _load_catalog, version=None if version is None else (version,)
     )
+
+
+def mark_changed(db: Session) -> None:
+    """Bump the catalog version; call before committing an exercise write."""
+    bump_version(db, "exercises")
+
+
+def publish_exercise(type: str, out: schemas.ExerciseOut) -> None:
+    publish(type, {"exercise": out.model_dump()})
+
+
+def create_exercise(
+    db: Session, payload: schemas.ExerciseCreate
+) -> schemas.ExerciseOut:
+    ex = new_exercise(payload)
     db.add(ex)
+    mark_changed(db)
     db.commit()
+    _catalog.invalidate()
     db.refresh(ex)
-    return schemas.ExerciseOut(
-        id=ex.id,
-        name=ex.name,
-        side=ex.side,
-        category=ex.category,
-        target_sets=ex.target_sets,
-        target_reps=ex.target_reps,
-        target_hold_sec=ex.target_hold_sec,
-        schedule_dow=json.loads(ex.schedule_dow or "[]"),
-    )
+    out = exercise_out(ex)
+    publish_exercise("exercise.created", out)
+    return out
 
 
 def list_exercises(db: Session) -> list[schemas.ExerciseOut]:
-    items = db.query(models.Exercise).order_by(models.Exercise.id).all()
-    result: list[schemas.ExerciseOut] = []
-    for ex in items:
-        result.append(
-            schemas.ExerciseOut(
-                id=ex.id,
-                name=ex.name,
-                side=ex.side,
-                category=ex.category,
-                target_sets=ex.target_sets,
-                target_reps=ex.target_reps,
-                target_hold_sec=ex.target_hold_sec,
-                schedule_dow=json.loads(ex.schedule_dow or "[]"),
-            )
-        )
-    return result
+    return list(catalog(db).items)
 
 
 def get_exercise(db: Session, exercise_id: int) -> schemas.ExerciseOut | None:
-    ex = db.get(models.Exercise, exercise_id)
-    if not ex:
-        return None
-    return schemas.ExerciseOut(
-        id=ex.id,
-        name=ex.name,
-        side=ex.side,
-        category=ex.category,
-        target_sets=ex.target_sets,
-        target_reps=ex.target_reps,
-        target_hold_sec=ex.target_hold_sec,
-        schedule_dow=json.loads(ex.schedule_dow or "[]"),
-    )
+    return catalog(db).by_id.get(exercise_id)
 
 
 def update_exercise(
@@ -74,31 +110,42 @@ def update_exercise(
     ex = db.get(models.Exercise, exercise_id)
     if not ex:
         return None
-    data = payload.model_dump(exclude_unset=True)
-    # apply updates
-    for field, value in data.items():
-        if field == "schedule_dow":
-            setattr(ex, field, json.dumps(value))
-        else:
-            setattr(ex, field, value)
+    apply_update(ex, payload)
+    mark_changed(db)
     db.commit()
+    _catalog.invalidate()
     db.refresh(ex)
-    return schemas.ExerciseOut(
-        id=ex.id,
-        name=ex.name,
-        side=ex.side,
-        category=ex.category,
-        target_sets=ex.target_sets,
-        target_reps=ex.target_reps,
-        target_hold_sec=ex.target_hold_sec,
-        schedule_dow=json.loads(ex.schedule_dow or "[]"),
-    )
+    out = exercise_out(ex)
+    publish_exercise("exercise.updated", out)
+    return out
 
 
 def delete_exercise(db: Session, exercise_id: int) -> bool:
     ex = db.get(models.Exercise, exercise_id)
     if not ex:
         return False
+    # One DELETE; ON DELETE CASCADE removes the sessions and rollups in SQLite
     db.delete(ex)
+    mark_changed(db)
+    bump_version(db, "sessions")
     db.commit()
-    return True
\ No newline at end of file
+    _catalog.invalidate()
+    # Its sessions went with it; subscribers reload rather than patch
+    publish("exercise.deleted", {"id": exercise_id})
+    return True
+
+def list_due_exercises(db: Session, day: date) -> list[schemas.ExerciseOut]:
+    """Exercises scheduled on ``day``'s weekday.
+
+    Matches the 64 masks containing that weekday's bit with an IN list, which
+    SQLite answers from ix_exercises_schedule_mask; a ``mask & bit`` test
+    would have to scan every row.
+    """
+    weekday = (day.weekday() + 1) % 7  # date.weekday() has Monday=0
+    items = (
+        db.query(models.Exercise)
+        .filter(models.Exercise.schedule_mask.in_(models.masks_with_day(weekday)))
+        .order_by(models.Exercise.id)
+        .all()
+    )
+    return [exercise_out(ex) for ex in items]
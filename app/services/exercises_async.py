@@ -0,0 +1,70 @@
+"""AsyncSession counterparts of ``app.services.exercises``."""
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models
+from .. import schemas
+from ..cache import bump_version
+from ..events import publish
+from .exercises import (
+    _catalog,
+    apply_update,
+    catalog,
+    exercise_out,
+    mark_changed,
+    new_exercise,
+    publish_exercise,
+)
+
+
+async def create_exercise(
+    db: AsyncSession, payload: schemas.ExerciseCreate
+) -> schemas.ExerciseOut:
+    ex = new_exercise(payload)
+    db.add(ex)
+    await db.run_sync(mark_changed)
+    await db.commit()
+    _catalog.invalidate()
+    await db.refresh(ex)
+    out = exercise_out(ex)
+    publish_exercise("exercise.created", out)
+    return out
+
+
+async def list_exercises(db: AsyncSession) -> list[schemas.ExerciseOut]:
+    return list((await db.run_sync(catalog)).items)
+
+
+async def get_exercise(
+    db: AsyncSession, exercise_id: int
+) -> schemas.ExerciseOut | None:
+    return (await db.run_sync(catalog)).by_id.get(exercise_id)
+
+
+async def update_exercise(
+    db: AsyncSession,
+    exercise_id: int,
+    payload: schemas.ExerciseUpdate,
+) -> schemas.ExerciseOut | None:
+    ex = await db.get(models.Exercise, exercise_id)
+    if not ex:
+        return None
+    apply_update(ex, payload)
+    await db.run_sync(mark_changed)
+    await db.commit()
+    _catalog.invalidate()
+    await db.refresh(ex)
+    out = exercise_out(ex)
+    publish_exercise("exercise.updated", out)
+    return out
+
+
+async def delete_exercise(db: AsyncSession, exercise_id: int) -> bool:
+    ex = await db.get(models.Exercise, exercise_id)
+    if not ex:
+        return False
+    await db.delete(ex)
+    await db.run_sync(mark_changed)
+    await db.run_sync(bump_version, "sessions")
+    await db.commit()
+    _catalog.invalidate()
+    publish("exercise.deleted", {"id": exercise_id})
+    return True
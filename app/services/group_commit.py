@@ -0,0 +1,159 @@
+"""Group commit for ``POST /sessions`` (opt in with ``SESSION_GROUP_COMMIT``).
+
+Request handlers hand their payload to a single writer thread and wait for
+the result. The writer takes everything queued, waiting up to
+``GROUP_COMMIT_WINDOW_MS`` after the first item for more (at most
+``GROUP_COMMIT_MAX_BATCH``), and inserts the batch in one transaction: one
+commit, one rollup refresh and one version bump shared by many requests,
+instead of each request queueing on SQLite's write lock for its own commit.
+Each caller still gets its own row (and id) back.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from prometheus_client import Histogram
+from .. import schemas
+from . import sessions as session_service
+
+log = logging.getLogger(__name__)
+
+BATCH_SIZE = Histogram(
+    "session_write_batch_size",
+    "Sessions inserted per group commit",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+QUEUE_WAIT = Histogram(
+    "session_write_queue_wait_seconds",
+    "Time a session insert waited in the group-commit queue",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+_STOP = object()
+
+
+def _settle(future: Future, result=None, exception=None) -> None:
+    """Resolve ``future`` unless it already is (e.g. cancelled meanwhile)."""
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except Exception:  # InvalidStateError: cancelled or resolved
+        pass
+
+
+class GroupCommitWriter:
+    def __init__(self, session_factory, max_batch: int = 200, window_s=0.002):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.window_s = window_s
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        # Makes "not closed" and the enqueue atomic with respect to stop(), so
+        # nothing lands behind the stop marker
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="session-group-commit", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write everything already queued, then stop the thread."""
+        with self._lock:
+            self._closed = True
+            self._queue.put(_STOP)
+        if self._thread is not None:
+            self._thread.join()
+        # Left over only if the writer was never started
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                _settle(
+                    item[1], exception=RuntimeError("group-commit writer is stopped")
+                )
+
+    def submit(self, payload: schemas.SessionCreate) -> Future:
+        """Queue an insert; the future resolves to the SessionOut-shaped row,
+        or None if the exercise does not exist."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("group-commit writer is stopped")
+            self._queue.put((payload, future, time.perf_counter()))
+        return future
+
+    async def create_session_async(
+        self, payload: schemas.SessionCreate
+    ) -> dict | None:
+        return await asyncio.wrap_future(self.submit(payload))
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.perf_counter() + self.window_s
+            while len(batch) < self.max_batch:
+                try:
+                    # Drain what is already queued even once the window is over
+                    item = self._queue.get(
+                        timeout=max(deadline - time.perf_counter(), 0)
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._flush(batch)
+            except Exception as exc:
+                # Never let one batch kill the writer; later inserts would
+                # queue forever
+                log.exception("group commit writer failed a batch")
+                for _, future, _ in batch:
+                    _settle(future, exception=exc)
+
+    def _flush(self, batch: list) -> None:
+        started = time.perf_counter()
+        for _, _, queued in batch:
+            QUEUE_WAIT.observe(started - queued)
+        # Callers that gave up (cancelled awaits) are not written; the rest
+        # can no longer be cancelled
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        BATCH_SIZE.observe(len(batch))
+        payloads = [payload for payload, _, _ in batch]
+        try:
+            results = self._write(payloads)
+        except Exception:
+            # Do not let one bad row fail its neighbours: retry one by one so
+            # each caller gets its own result or error
+            log.exception("group commit of %d sessions failed", len(batch))
+            for payload, future, _ in batch:
+                try:
+                    result = self._write([payload])[0]
+                except Exception as exc:
+                    _settle(future, exception=exc)
+                else:
+                    _settle(future, result)
+            return
+        for (_, future, _), result in zip(batch, results):
+            _settle(future, result)
+
+    def _write(self, payloads: list) -> list[dict | None]:
+        with self.session_factory() as db:
+            return session_service.create_sessions_batch(db, payloads)
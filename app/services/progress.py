@@ -0,0 +1,138 @@
+"""ROM / pain progress analytics.
+
+Each request reads the needed session columns once, in (exercise_id, date)
+order, into NumPy arrays. Rolling means come from prefix sums plus
+``searchsorted`` on the day ordinals, so there is no per-session Python work
+after loading, whatever the history length.
+"""
+from datetime import date
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from .. import models
+from .sessions import session_filters
+
+_S = models.ExerciseSession
+
+# Rolling windows in days, ending on (and including) each session day
+WINDOWS = (7, 28)
+METRICS = (("rom", _S.rom_deg), ("pain", _S.pain_0_10))
+
+
+def _load(db: Session, from_date=None, to_date=None, exercise_id=None):
+    """Return (exercise_ids, day ordinals, {metric: values}) sorted by both.
+
+    Missing readings are NaN so they drop out of every statistic.
+    """
+    stmt = (
+        select(_S.exercise_id, _S.date, *(col for _, col in METRICS))
+        .where(*session_filters(from_date, to_date, exercise_id))
+        .order_by(_S.exercise_id, _S.date)
+    )
+    rows = db.execute(stmt).all()
+    cols = list(zip(*rows)) or [()] * (2 + len(METRICS))
+    ex_ids = np.array(cols[0], dtype=np.int64)
+    days = np.fromiter(
+        (d.toordinal() for d in cols[1]), dtype=np.int64, count=len(rows)
+    )
+    values = {
+        name: np.array(cols[2 + i], dtype=np.float64)  # None -> NaN
+        for i, (name, _) in enumerate(METRICS)
+    }
+    return ex_ids, days, values
+
+
+def _prefix(values):
+    """Prefix sums of values and of non-missing counts, with a leading 0."""
+    present = ~np.isnan(values)
+    total = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+    count = np.concatenate(([0], np.cumsum(present)))
+    return total, count
+
+
+def _window_mean(days, prefix, lo, hi):
+    """Mean of the values whose day falls in (lo, hi], per element of lo/hi."""
+    total, count = prefix
+    a = np.searchsorted(days, lo, side="right")
+    b = np.searchsorted(days, hi, side="right")
+    n = count[b] - count[a]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (total[b] - total[a]) / n  # NaN where the window is empty
+
+
+def _slope(days, values):
+    """Least-squares slope of values against day, in units per week."""
+    present = ~np.isnan(values)
+    x = days[present].astype(np.float64)
+    y = values[present]
+    if x.size < 2:
+        return None
+    x -= x.mean()
+    denom = x @ x
+    if denom == 0:
+        return None
+    return float(x @ (y - y.mean()) / denom * 7)
+
+
+def _clean(arr):
+    """Array -> list of rounded floats with None for NaN."""
+    return [None if v != v else v for v in np.round(arr, 2).tolist()]
+
+
+def _progress(exercise_id: int, days, values) -> dict:
+    """Statistics for one exercise; ``days`` is sorted ascending."""
+    out = {
+        "exercise_id": exercise_id,
+        "sessions": int(days.size),
+        "first_date": date.fromordinal(int(days[0])) if days.size else None,
+        "last_date": date.fromordinal(int(days[-1])) if days.size else None,
+    }
+    points = np.unique(days)
+    cols = {"date": [date.fromordinal(d) for d in points.tolist()]}
+    for name, vals in values.items():
+        prefix = _prefix(vals)
+        cols[f"{name}_mean"] = _clean(_window_mean(days, prefix, points - 1, points))
+        for w in WINDOWS:
+            cols[f"{name}_{w}d"] = _clean(
+                _window_mean(days, prefix, points - w, points)
+            )
+        # This week's mean minus the mean of the 7 days before it
+        wow = _window_mean(days, prefix, points - 7, points) - _window_mean(
+            days, prefix, points - 14, points - 7
+        )
+        cols[f"{name}_wow"] = _clean(wow)
+        slope = _slope(days, vals)
+        out[f"{name}_slope_per_week"] = None if slope is None else round(slope, 4)
+        out[f"{name}_wow_delta"] = cols[f"{name}_wow"][-1] if points.size else None
+    keys = list(cols)
+    out["points"] = [dict(zip(keys, row)) for row in zip(*cols.values())]
+    return out
+
+
+def exercise_progress(
+    db: Session, exercise_id: int, from_date=None, to_date=None
+) -> dict | None:
+    if not db.get(models.Exercise, exercise_id):
+        return None
+    _, days, values = _load(db, from_date, to_date, exercise_id)
+    return _progress(exercise_id, days, values)
+
+
+def all_progress(db: Session, from_date=None, to_date=None) -> list[dict]:
+    """Progress for every exercise from a single scan of ``sessions``.
+
+    Exercises without sessions in range are included with empty series.
+    """
+    ex_ids, days, values = _load(db, from_date, to_date)
+    # Rows are grouped by exercise; split the arrays at each id change
+    ids, starts = np.unique(ex_ids, return_index=True)
+    ends = starts[1:].tolist() + [len(days)]
+    bounds = dict(zip(ids.tolist(), zip(starts.tolist(), ends)))
+    out = []
+    for ex_id in db.scalars(select(models.Exercise.id).order_by(models.Exercise.id)):
+        a, b = bounds.get(ex_id, (0, 0))
+        out.append(
+            _progress(ex_id, days[a:b], {k: v[a:b] for k, v in values.items()})
+        )
+    return out
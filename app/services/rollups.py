@@ -0,0 +1,168 @@
+"""Maintenance and queries for the ``session_daily_rollup`` table.
+
+Writes to ``sessions`` call ``refresh_rollups`` with the (exercise_id, date)
+keys they touched, before committing. Each key is recomputed from its raw
+sessions. Keys are matched with one ``exercise_id = ? AND date = ?`` term
+per key, which SQLite answers with a lookup per key on
+ix_sessions_exercise_date_id; a row-value ``IN`` would scan the table.
+Recomputing rather than applying deltas keeps min/max correct when the
+row holding the extreme value is updated or deleted.
+
+Rebuild everything for an existing database with::
+
+    python -m app.services.rollups sqlite:///./rehab.db
+"""
+import sys
+from datetime import date
+
+from sqlalchemy import and_, create_engine, delete, func, insert, null, or_, select
+from sqlalchemy.orm import Session
+from .. import models
+from .. import schemas
+
+# Keeps each statement well under SQLite's bound-parameter limit
+_KEY_BATCH = 500
+
+_R = models.SessionDailyRollup
+_S = models.ExerciseSession
+_ROLLUP_COLUMNS = [
+    _R.exercise_id,
+    _R.date,
+    _R.session_count,
+    _R.pain_sum,
+    _R.pain_count,
+    _R.pain_min,
+    _R.pain_max,
+    _R.rom_max,
+    _R.volume,
+]
+
+
+def _aggregate():
+    return select(
+        _S.exercise_id,
+        _S.date,
+        func.count(_S.id),
+        func.coalesce(func.sum(_S.pain_0_10), 0),
+        func.count(_S.pain_0_10),
+        func.min(_S.pain_0_10),
+        func.max(_S.pain_0_10),
+        func.max(_S.rom_deg),
+        func.coalesce(
+            func.sum(func.coalesce(_S.sets, 0) * func.coalesce(_S.reps, 0)), 0
+        ),
+    ).group_by(_S.exercise_id, _S.date)
+
+
+def _batches(keys: list):
+    for i in range(0, len(keys), _KEY_BATCH):
+        yield keys[i:i + _KEY_BATCH]
+
+
+def _matching(table, keys):
+    return or_(*(and_(table.exercise_id == ex, table.date == day) for ex, day in keys))
+
+
+def refresh_rollups(db, keys) -> None:
+    """Recompute the rollup rows for ``keys`` ((exercise_id, date) pairs).
+
+    Works on a Session or a Connection. Pending ORM changes must be flushed
+    first so the recomputation sees them.
+    """
+    for batch in _batches(list(set(keys))):
+        db.execute(delete(_R).where(_matching(_R, batch)))
+        db.execute(
+            insert(_R).from_select(
+                _ROLLUP_COLUMNS, _aggregate().where(_matching(_S, batch))
+            )
+        )
+
+
+def rebuild_rollups(db) -> None:
+    """Recompute the whole table from ``sessions``."""
+    db.execute(delete(_R))
+    db.execute(insert(_R).from_select(_ROLLUP_COLUMNS, _aggregate()))
+
+
+def rollup_dict(row) -> dict:
+    """A row of ``_ROLLUP_COLUMNS`` shaped like DailyRollupOut."""
+    ex_id, day, count, pain_sum, pain_count, pmin, pmax, rom_max, volume = row
+    return {
+        "exercise_id": ex_id,
+        "date": day,
+        "session_count": count,
+        "pain_mean": pain_sum / pain_count if pain_count else None,
+        "pain_min": pmin,
+        "pain_max": pmax,
+        "rom_max": rom_max,
+        "volume": volume,
+    }
+
+
+def all_rollup_dicts(db) -> list[dict]:
+    """Every rollup row as DailyRollupOut-shaped dicts, oldest first."""
+    stmt = select(*_ROLLUP_COLUMNS).order_by(_R.date, _R.exercise_id)
+    return [rollup_dict(row) for row in db.execute(stmt)]
+
+
+def rollup_rows(db, keys) -> list[dict]:
+    """Current rollups for ``keys`` as DailyRollupOut-shaped dicts.
+
+    Keys with no sessions left are included with a ``session_count`` of 0,
+    so a consumer can drop them.
+    """
+    keys = set(keys)
+    found = []
+    for batch in _batches(list(keys)):
+        stmt = select(*_ROLLUP_COLUMNS).where(_matching(_R, batch))
+        found.extend(rollup_dict(row) for row in db.execute(stmt))
+    for ex_id, day in keys - {(r["exercise_id"], r["date"]) for r in found}:
+        found.append(rollup_dict((ex_id, day, 0, 0, 0, None, None, None, 0)))
+    return found
+
+
+def daily_rollups(
+    db: Session,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    exercise_id: int | None = None,
+    by_exercise: bool = True,
+) -> list[schemas.DailyRollupOut]:
+    """Daily totals read from the rollup table, oldest first.
+
+    With ``by_exercise=False`` the exercises are combined into one row per day.
+    """
+    if by_exercise:
+        stmt = select(*_ROLLUP_COLUMNS).order_by(_R.date, _R.exercise_id)
+    else:
+        stmt = (
+            select(
+                null(),
+                _R.date,
+                func.sum(_R.session_count),
+                func.sum(_R.pain_sum),
+                func.sum(_R.pain_count),
+                func.min(_R.pain_min),
+                func.max(_R.pain_max),
+                func.max(_R.rom_max),
+                func.sum(_R.volume),
+            )
+            .group_by(_R.date)
+            .order_by(_R.date)
+        )
+    if from_date:
+        stmt = stmt.where(_R.date >= from_date)
+    if to_date:
+        stmt = stmt.where(_R.date <= to_date)
+    if exercise_id:
+        stmt = stmt.where(_R.exercise_id == exercise_id)
+
+    return [schemas.DailyRollupOut(**rollup_dict(row)) for row in db.execute(stmt)]
+
+
+if __name__ == "__main__":
+    url = sys.argv[1] if len(sys.argv) > 1 else "sqlite:///./rehab.db"
+    with create_engine(url).begin() as conn:
+        rebuild_rollups(conn)
+        n = conn.scalar(select(func.count()).select_from(_R))
+    print(f"{url}: rebuilt {n} daily rollup rows")
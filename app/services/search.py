@@ -0,0 +1,92 @@
+"""Full-text search over session notes (SQLite FTS5).
+
+``sessions_fts`` and its sync triggers are declared in ``app.models``. Create
+or rebuild the index for an existing database with::
+
+    python -m app.services.search sqlite:///./rehab.db
+"""
+import sys
+
+from sqlalchemy import column, create_engine, func, literal_column, select, table
+from sqlalchemy.orm import Session
+from .. import models
+from .sessions import SESSION_OUT_COLUMNS, session_filters
+
+_FTS = table("sessions_fts", column("rowid"))
+# The table-named column FTS5 uses for MATCH and the auxiliary functions
+_FTS_SELF = literal_column("sessions_fts")
+
+
+def reindex(db) -> None:
+    """Create the index and triggers if missing, then rebuild from ``sessions``."""
+    for ddl in models.SESSIONS_FTS_DDL:
+        db.exec_driver_sql(ddl)
+    db.exec_driver_sql("INSERT INTO sessions_fts (sessions_fts) VALUES ('rebuild')")
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query requiring every word.
+
+    Words are quoted so punctuation and FTS operators in user input are
+    matched literally instead of raising syntax errors; a trailing ``*``
+    keeps prefix matching (``swell*``).
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search_sessions(
+    db: Session,
+    q: str,
+    from_date=None,
+    to_date=None,
+    exercise_id=None,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[list[dict], int | None]:
+    """One page of sessions whose notes match ``q``, best match first.
+
+    Returns SessionOut-shaped dicts with ``score`` (negated bm25, higher is
+    better) and a highlighted ``snippet``, plus the offset of the next page.
+    """
+    match = fts_query(q)
+    if not match:
+        return [], None
+    s = models.ExerciseSession
+    bm25 = func.bm25(_FTS_SELF)
+    stmt = (
+        select(
+            *SESSION_OUT_COLUMNS,
+            (-bm25).label("score"),
+            func.snippet(_FTS_SELF, 0, "[", "]", "…", 12).label("snippet"),
+        )
+        .select_from(_FTS.join(s, s.id == _FTS.c.rowid))
+        .where(
+            _FTS_SELF.match(match),
+            *session_filters(from_date, to_date, exercise_id),
+        )
+        .order_by(bm25, s.id)
+        .limit(limit + 1)
+        .offset(offset)
+    )
+    rows = [row._asdict() for row in db.execute(stmt)]
+    next_offset = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_offset = offset + limit
+    for row in rows:
+        row["score"] = round(row["score"], 4)
+    return rows, next_offset
+
+
+if __name__ == "__main__":
+    url = sys.argv[1] if len(sys.argv) > 1 else "sqlite:///./rehab.db"
+    with create_engine(url).begin() as conn:
+        reindex(conn)
+        n = conn.exec_driver_sql("SELECT count(*) FROM sessions").scalar()
+    print(f"{url}: reindexed notes of {n} sessions")
@@ -1,6 +1,24 @@
+import base64
+from datetime import date
+
+from sqlalchemy import and_, func, insert, or_, select
 from sqlalchemy.orm import Session
 from .. import models
 from .. import schemas
+from ..cache import bump_version
+from ..events import publish
+from .rollups import refresh_rollups, rollup_rows
+
+
+def session_change(db: Session, s: models.ExerciseSession, keys) -> dict:
+    """Change-feed payload for a session write: the row and its days' rollups.
+
+    Read before committing, so the rollups are exactly this write's result.
+    """
+    return {
+        "session": {f: getattr(s, f) for f in schemas.SessionOut.model_fields},
+        "daily": rollup_rows(db, keys),
+    }
 
 
 def get_session(db: Session, id: int) -> schemas.SessionOut | None:
@@ -18,10 +36,18 @@ def update_session(
     s = db.get(models.ExerciseSession, id)
     if not s:
         return None
+    old_key = (s.exercise_id, s.date)
     update_data = payload.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(s, field, value)
+    db.flush()
+    # Covers moves to another date or exercise: both days are recomputed
+    keys = {old_key, (s.exercise_id, s.date)}
+    refresh_rollups(db, keys)
+    bump_version(db, "sessions")
+    change = session_change(db, s, keys)
     db.commit()
+    publish("session.updated", change)
     db.refresh(s)
     return s
 
@@ -31,7 +57,13 @@ def delete_session(db: Session, id: int) -> bool:
     if not s:
         return False
     db.delete(s)
+    db.flush()
+    keys = [(s.exercise_id, s.date)]
+    refresh_rollups(db, keys)
+    bump_version(db, "sessions")
+    change = session_change(db, s, keys)
     db.commit()
+    publish("session.deleted", change)
     return True
 
 
@@ -43,20 +75,268 @@ def create_session(
         return None
     s = models.ExerciseSession(**payload.model_dump())
     db.add(s)
+    db.flush()
+    keys = [(s.exercise_id, s.date)]
+    refresh_rollups(db, keys)
+    bump_version(db, "sessions")
+    change = session_change(db, s, keys)
     db.commit()
+    publish("session.created", change)
     db.refresh(s)
     return s
 
 
+SESSION_ORDER = (
+    models.ExerciseSession.date.desc(),
+    models.ExerciseSession.id.desc(),
+)
+
+
+def session_filters(from_date=None, to_date=None, exercise_id=None) -> list:
+    """WHERE criteria shared by the sync and async listing queries."""
+    criteria = []
+    if from_date:
+        criteria.append(models.ExerciseSession.date >= from_date)
+    if to_date:
+        criteria.append(models.ExerciseSession.date <= to_date)
+    if exercise_id:
+        criteria.append(models.ExerciseSession.exercise_id == exercise_id)
+    return criteria
+
+
+def seek_after(cursor: str):
+    """Keyset predicate selecting rows after ``cursor`` in SESSION_ORDER."""
+    c_date, c_id = decode_cursor(cursor)
+    return or_(
+        models.ExerciseSession.date < c_date,
+        and_(
+            models.ExerciseSession.date == c_date,
+            models.ExerciseSession.id < c_id,
+        ),
+    )
+
+
+def _filtered_sessions(db: Session, from_date=None, to_date=None, exercise_id=None):
+    return (
+        db.query(models.ExerciseSession)
+        .filter(*session_filters(from_date, to_date, exercise_id))
+        .order_by(*SESSION_ORDER)
+    )
+
+
+def create_sessions_bulk(
+    db: Session, payloads: list[schemas.SessionCreate]
+) -> list[int | None]:
+    """Insert many sessions in one transaction.
+
+    Returns the new id for each payload, in order, or None where the
+    referenced exercise does not exist (those rows are skipped).
+    """
+    if not payloads:
+        return []
+    known = _known_exercises(db, payloads)
+    rows = [p.model_dump() for p in payloads if p.exercise_id in known]
+    new_ids = _insert_rows(db, rows)
+    db.commit()
+    if new_ids:
+        # Too many rows to send individually; subscribers reload instead
+        publish("session.bulk", {"created": len(new_ids)})
+    ids = iter(new_ids)
+    return [next(ids) if p.exercise_id in known else None for p in payloads]
+
+
+def create_sessions_batch(
+    db: Session, payloads: list[schemas.SessionCreate]
+) -> list[dict | None]:
+    """Insert sessions from independent requests in one transaction.
+
+    Used by the group-commit writer. Returns a SessionOut-shaped dict per
+    payload, in order, or None where the exercise does not exist, and
+    publishes a ``session.created`` event per row like ``create_session``.
+    """
+    known = _known_exercises(db, payloads)
+    rows = [p.model_dump() for p in payloads if p.exercise_id in known]
+    for row, new_id in zip(rows, _insert_rows(db, rows)):
+        row["id"] = new_id
+    daily = {
+        (d["exercise_id"], d["date"]): d
+        for d in rollup_rows(db, {(r["exercise_id"], r["date"]) for r in rows})
+    }
+    db.commit()
+    for row in rows:
+        publish("session.created", {
+            "session": row, "daily": [daily[(row["exercise_id"], row["date"])]],
+        })
+    created = iter(rows)
+    return [next(created) if p.exercise_id in known else None for p in payloads]
+
+
+def _known_exercises(db: Session, payloads) -> set[int]:
+    wanted = {p.exercise_id for p in payloads}
+    return set(
+        db.scalars(
+            select(models.Exercise.id).where(models.Exercise.id.in_(wanted))
+        )
+    )
+
+
+def _insert_rows(db: Session, rows: list[dict]) -> list[int]:
+    """Insert ``rows`` and maintain rollups and the version; no commit."""
+    if not rows:
+        return []
+    stmt = insert(models.ExerciseSession).returning(
+        models.ExerciseSession.id, sort_by_parameter_order=True
+    )
+    new_ids = list(db.scalars(stmt, rows))
+    refresh_rollups(db, {(r["exercise_id"], r["date"]) for r in rows})
+    bump_version(db, "sessions")
+    return new_ids
+
+
 def list_sessions(db: Session, from_date=None, to_date=None, exercise_id=None):
-    q = db.query(models.ExerciseSession)
+    return _filtered_sessions(db, from_date, to_date, exercise_id).all()
+
+
+# Columns in SessionOut field order, for reading rows without ORM objects
+SESSION_OUT_COLUMNS = tuple(
+    getattr(models.ExerciseSession, f) for f in schemas.SessionOut.model_fields
+)
+
+
+def list_session_rows(
+    db: Session, from_date=None, to_date=None, exercise_id=None
+) -> list[dict]:
+    """Like ``list_sessions`` but as plain dicts shaped like SessionOut.
+
+    Skips identity-map bookkeeping and per-row Pydantic validation; the
+    values were validated when written.
+    """
+    q = _filtered_sessions(db, from_date, to_date, exercise_id)
+    return [row._asdict() for row in q.with_entities(*SESSION_OUT_COLUMNS)]
+
+
+EXPORT_COLUMNS = (
+    "id",
+    "exercise_id",
+    "date",
+    "sets",
+    "reps",
+    "hold_sec",
+    "pain_0_10",
+    "rom_deg",
+    "notes",
+)
+
+
+def iter_session_rows(
+    db: Session,
+    from_date=None,
+    to_date=None,
+    exercise_id=None,
+    batch_size: int = 1000,
+):
+    """Yield plain row tuples (EXPORT_COLUMNS order) without materialising the
+    full result; rows are fetched from the cursor ``batch_size`` at a time."""
+    cols = [getattr(models.ExerciseSession, c) for c in EXPORT_COLUMNS]
+    q = _filtered_sessions(db, from_date, to_date, exercise_id).with_entities(*cols)
+    yield from q.yield_per(batch_size)
+
+
+def encode_cursor(s) -> str:
+    """Opaque cursor pointing just after ``s`` in (date desc, id desc) order."""
+    raw = f"{s.date.isoformat()}|{s.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    """Inverse of ``encode_cursor``; raises ValueError on a malformed token."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        day, _, sid = raw.partition("|")
+        return date.fromisoformat(day), int(sid)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def list_sessions_page(
+    db: Session,
+    from_date=None,
+    to_date=None,
+    exercise_id=None,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """Return one keyset page of session dicts and the cursor for the next one.
+
+    Seeks past the cursor position instead of using OFFSET, so the cost of a
+    page does not grow with how deep into the history it is.
+    """
+    q = _filtered_sessions(db, from_date, to_date, exercise_id)
+    if cursor:
+        q = q.filter(seek_after(cursor))
+    q = q.with_entities(*SESSION_OUT_COLUMNS).limit(limit + 1)
+    return split_page(q.all(), limit)
+
+
+def split_page(rows: list, limit: int) -> tuple[list[dict], str | None]:
+    """Trim the look-ahead row fetched with ``limit + 1`` into a next cursor."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+    return [row._asdict() for row in rows], next_cursor
+
+
+def _bucket_expr(bucket: str):
+    col = models.ExerciseSession.date
+    if bucket == "week":
+        # Monday on or before the session date
+        return func.date(col, "-6 days", "weekday 1")
+    if bucket == "month":
+        return func.strftime("%Y-%m-01", col)
+    return func.date(col)
+
+
+def session_series(
+    db: Session,
+    bucket: str = "day",
+    from_date=None,
+    to_date=None,
+    exercise_id=None,
+) -> list[schemas.SeriesPoint]:
+    """Aggregate pain and ROM per exercise and time bucket in SQL."""
+    s = models.ExerciseSession
+    b = _bucket_expr(bucket).label("bucket")
+    q = db.query(
+        s.exercise_id,
+        b,
+        func.count(s.id),
+        func.avg(s.pain_0_10),
+        func.min(s.pain_0_10),
+        func.max(s.pain_0_10),
+        func.avg(s.rom_deg),
+        func.min(s.rom_deg),
+        func.max(s.rom_deg),
+    )
     if from_date:
-        q = q.filter(models.ExerciseSession.date >= from_date)
+        q = q.filter(s.date >= from_date)
     if to_date:
-        q = q.filter(models.ExerciseSession.date <= to_date)
+        q = q.filter(s.date <= to_date)
     if exercise_id:
-        q = q.filter(models.ExerciseSession.exercise_id == exercise_id)
-    return q.order_by(
-        models.ExerciseSession.date.desc(),
-        models.ExerciseSession.id.desc(),
-    ).all()
+        q = q.filter(s.exercise_id == exercise_id)
+    rows = q.group_by(s.exercise_id, b).order_by(s.exercise_id, b).all()
+    return [
+        schemas.SeriesPoint(
+            exercise_id=row[0],
+            bucket=row[1],
+            count=row[2],
+            pain_mean=row[3],
+            pain_min=row[4],
+            pain_max=row[5],
+            rom_mean=row[6],
+            rom_min=row[7],
+            rom_max=row[8],
+        )
+        for row in rows
+    ]
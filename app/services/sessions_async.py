@@ -0,0 +1,115 @@
+"""AsyncSession counterparts of ``app.services.sessions``."""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models
+from .. import schemas
+from ..cache import bump_version
+from ..events import publish
+from .rollups import refresh_rollups
+from .sessions import (
+    SESSION_ORDER,
+    SESSION_OUT_COLUMNS,
+    seek_after,
+    session_change,
+    session_filters,
+    split_page,
+)
+
+
+async def get_session(db: AsyncSession, id: int) -> schemas.SessionOut | None:
+    return await db.get(models.ExerciseSession, id)
+
+
+async def update_session(
+    db: AsyncSession,
+    id: int,
+    payload: schemas.SessionUpdate,
+) -> schemas.SessionOut | None:
+    s = await db.get(models.ExerciseSession, id)
+    if not s:
+        return None
+    old_key = (s.exercise_id, s.date)
+    update_data = payload.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(s, field, value)
+    await db.flush()
+    keys = {old_key, (s.exercise_id, s.date)}
+    await db.run_sync(refresh_rollups, keys)
+    await db.run_sync(bump_version, "sessions")
+    change = await db.run_sync(session_change, s, keys)
+    await db.commit()
+    publish("session.updated", change)
+    await db.refresh(s)
+    return s
+
+
+async def delete_session(db: AsyncSession, id: int) -> bool:
+    s = await db.get(models.ExerciseSession, id)
+    if not s:
+        return False
+    await db.delete(s)
+    await db.flush()
+    keys = [(s.exercise_id, s.date)]
+    await db.run_sync(refresh_rollups, keys)
+    await db.run_sync(bump_version, "sessions")
+    change = await db.run_sync(session_change, s, keys)
+    await db.commit()
+    publish("session.deleted", change)
+    return True
+
+
+async def create_session(
+    db: AsyncSession, payload: schemas.SessionCreate
+) -> schemas.SessionOut | None:
+    # Ensure exercise exists
+    if not await db.get(models.Exercise, payload.exercise_id):
+        return None
+    s = models.ExerciseSession(**payload.model_dump())
+    db.add(s)
+    await db.flush()
+    keys = [(s.exercise_id, s.date)]
+    await db.run_sync(refresh_rollups, keys)
+    await db.run_sync(bump_version, "sessions")
+    change = await db.run_sync(session_change, s, keys)
+    await db.commit()
+    publish("session.created", change)
+    await db.refresh(s)
+    return s
+
+
+def _sessions_select(from_date=None, to_date=None, exercise_id=None, columns=None):
+    return (
+        select(*(columns or (models.ExerciseSession,)))
+        .where(*session_filters(from_date, to_date, exercise_id))
+        .order_by(*SESSION_ORDER)
+    )
+
+
+async def list_sessions(
+    db: AsyncSession, from_date=None, to_date=None, exercise_id=None
+):
+    result = await db.scalars(_sessions_select(from_date, to_date, exercise_id))
+    return result.all()
+
+
+async def list_session_rows(
+    db: AsyncSession, from_date=None, to_date=None, exercise_id=None
+) -> list[dict]:
+    stmt = _sessions_select(from_date, to_date, exercise_id, SESSION_OUT_COLUMNS)
+    result = await db.execute(stmt)
+    return [row._asdict() for row in result]
+
+
+async def list_sessions_page(
+    db: AsyncSession,
+    from_date=None,
+    to_date=None,
+    exercise_id=None,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    stmt = _sessions_select(from_date, to_date, exercise_id, SESSION_OUT_COLUMNS)
+    if cursor:
+        stmt = stmt.where(seek_after(cursor))
+    result = await db.execute(stmt.limit(limit + 1))
+    return split_page(result.all(), limit)
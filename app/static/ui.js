@@ -1,59 +1,170 @@
+// --- Dashboard ---
+// Exercises, recent sessions, category counts and the chart data arrive in a
+// single /dashboard response; afterwards the /events change feed patches the
+// local copy, so saves (ours or another viewer's) never refetch the lists.
+const RECENT_SESSIONS = 50;
+const state = { exercises: [], sessions: [], daily: [] };
+let eventSource = null;
+
+async function loadDashboard() {
+  const res = await fetch(`/dashboard?limit=${RECENT_SESSIONS}`);
+  const data = await res.json();
+  state.exercises = data.exercises;
+  state.sessions = data.recent_sessions;
+  state.daily = data.daily;
+  renderAll();
+  if (!eventSource) {
+    connectEvents(res.headers.get('X-Last-Event-Id'));
+  }
+}
+
+function renderAll() {
+  renderExercises(state.exercises);
+  renderCategoryPieChart(categoryCounts(state.exercises));
+  renderSessionsAndChart();
+}
+
+function renderSessionsAndChart() {
+  const exMap = {};
+  state.exercises.forEach(ex => { exMap[ex.id] = ex.name; });
+  renderSessions(state.sessions, totalSessions(), exMap);
+  renderPainLineChart(state.daily, exMap);
+}
+
+// The daily rollups cover the whole history, so they give the total
+function totalSessions() {
+  return state.daily.reduce((n, d) => n + d.session_count, 0);
+}
+
+function categoryCounts(exercises) {
+  const counts = { strength: 0, mobility: 0, balance: 0 };
+  exercises.forEach(ex => {
+    if (counts[ex.category] !== undefined) counts[ex.category]++;
+  });
+  return counts;
+}
+
+// --- Change feed ---
+function connectEvents(since) {
+  eventSource = new EventSource('/events' + (since ? `?since=${encodeURIComponent(since)}` : ''));
+  const on = (type, handler) => eventSource.addEventListener(type, ev => handler(JSON.parse(ev.data)));
+  on('session.created', applySessionChange);
+  on('session.updated', applySessionChange);
+  on('session.deleted', change => {
+    state.sessions = state.sessions.filter(s => s.id !== change.session.id);
+    applyDaily(change.daily);
+    renderOrReload();
+  });
+  on('exercise.created', change => applyExercise(change.exercise));
+  on('exercise.updated', change => applyExercise(change.exercise));
+  // Changes too large to patch (cascaded deletes, bulk imports) and feed
+  // gaps are handled by reloading
+  on('exercise.deleted', loadDashboard);
+  on('session.bulk', loadDashboard);
+  on('reset', loadDashboard);
+}
+
+// Refetch after our own write only when the change feed is not delivering it
+function refreshIfOffline() {
+  if (!eventSource || eventSource.readyState !== EventSource.OPEN) {
+    return loadDashboard();
+  }
+}
+
+function sessionBefore(a, b) {
+  return a.date > b.date || (a.date === b.date && a.id > b.id);
+}
+
+function applySessionChange(change) {
+  const s = change.session;
+  applyDaily(change.daily);
+  const sessions = state.sessions.filter(x => x.id !== s.id);
+  // Only the newest RECENT_SESSIONS are held; an older row belongs only if
+  // nothing else is older than it
+  const last = sessions[sessions.length - 1];
+  if ((last && sessionBefore(s, last)) || totalSessions() <= sessions.length + 1) {
+    sessions.push(s);
+    sessions.sort((a, b) => (sessionBefore(a, b) ? -1 : 1));
+  }
+  state.sessions = sessions.slice(0, RECENT_SESSIONS);
+  renderOrReload();
+}
+
+// A session that left the held window (deleted, or moved to an older date)
+// leaves a gap that only the server can fill with the next-newest row
+function renderOrReload() {
+  if (state.sessions.length < Math.min(RECENT_SESSIONS, totalSessions())) {
+    return loadDashboard();
+  }
+  renderSessionsAndChart();
+}
+
+function applyDaily(rows) {
+  const key = d => d.exercise_id + '|' + d.date;
+  const changed = new Set(rows.map(key));
+  state.daily = state.daily
+    .filter(d => !changed.has(key(d)))
+    .concat(rows.filter(d => d.session_count > 0));
+}
+
+function applyExercise(ex) {
+  state.exercises = state.exercises.filter(x => x.id !== ex.id).concat([ex]);
+  state.exercises.sort((a, b) => a.id - b.id);
+  renderAll();
+}
+
 // --- Pain Line Chart ---
 let painLineChartInstance = null;
-async function renderPainLineChart() {
-  const res = await fetch('/sessions');
-  const sessions = await res.json();
-  const exRes = await fetch('/exercises');
-  const exercises = await exRes.json();
-  const exMap = {};
-  exercises.forEach(ex => { exMap[ex.id] = ex.name; });
-  const points = [];
-  sessions.forEach(s => {
-    if (s.pain_0_10 !== null && s.pain_0_10 !== undefined) {
-      points.push({
-        x: exMap[s.exercise_id] || `Exercise ${s.exercise_id}`,
-        y: s.pain_0_10,
-        date: s.date
-      });
-    }
+// Read by the tooltip callback, so replacing it updates the tooltips too
+let painByExercise = {};
+function renderPainLineChart(daily, exMap) {
+  // Pain is aggregated server-side per exercise and day, so the payload
+  // scales with the number of days rather than the session history.
+  const labels = [...new Set(daily.map(p => p.date))].sort();
+  const byExercise = {};
+  daily.forEach(p => {
+    if (p.pain_mean === null || p.pain_mean === undefined) return;
+    (byExercise[p.exercise_id] = byExercise[p.exercise_id] || {})[p.date] = p;
   });
-  // Sort by exercise date
-  points.sort((a, b) => a.x.localeCompare(b.x) || a.date.localeCompare(b.date));
+  painByExercise = byExercise;
+  const datasets = Object.keys(byExercise).map((exId, idx) => ({
+    label: exMap[exId] || `Exercise ${exId}`,
+    data: labels.map(d => byExercise[exId][d] ? byExercise[exId][d].pain_mean : null),
+    borderColor: chartColor(idx),
+    backgroundColor: chartColor(idx, 0.2),
+    tension: 0.2,
+    spanGaps: true,
+    pointRadius: 4,
+    pointHoverRadius: 6
+  }));
   const ctx = document.getElementById('painLineChart');
   if (!ctx) return;
-  if (painLineChartInstance) painLineChartInstance.destroy();
+  if (painLineChartInstance) {
+    painLineChartInstance.data.labels = labels;
+    painLineChartInstance.data.datasets = datasets;
+    painLineChartInstance.update();
+    return;
+  }
   painLineChartInstance = new Chart(ctx, {
     type: 'line',
-    data: {
-      labels: points.map(p => p.x),
-      datasets: [{
-        label: 'Pain (0-10) per Session',
-        data: points.map(p => p.y),
-        borderColor: chartColor(0),
-        backgroundColor: chartColor(0, 0.2),
-        tension: 0.2,
-        spanGaps: true,
-        pointRadius: 4,
-        pointHoverRadius: 6
-      }]
-    },
+    data: { labels, datasets },
     options: {
       responsive: false,
       plugins: {
-        legend: { display: false },
+        legend: { display: true, position: 'bottom' },
         title: { display: true, text: 'Pain (0-10) per Exercise' },
         tooltip: {
           callbacks: {
-            title: (items) => {
-              const idx = items[0].dataIndex;
-              return points[idx].x + ' (' + points[idx].date + ')';
-            },
-            label: (item) => 'Pain: ' + item.formattedValue
+            title: (items) => items[0].dataset.label + ' (' + items[0].label + ')',
+            label: (item) => {
+              const p = painByExercise[Object.keys(painByExercise)[item.datasetIndex]][item.label];
+              return 'Pain: ' + item.formattedValue + ' (min ' + p.pain_min + ', max ' + p.pain_max + ', n=' + p.session_count + ')';
+            }
           }
         }
       },
       scales: {
-        x: { type: 'category', title: {display:true, text:'Exercise'} },
+        x: { type: 'category', title: {display:true, text:'Date'} },
         y: { min: 0, max: 10, title: {display:true, text:'Pain (0-10)'} }
       }
     }
@@ -80,7 +191,7 @@ async function deleteSession(id) {
   if (!ok) return;
   const res = await fetch(`/sessions/${id}`, { method: 'DELETE' });
   if (res.status === 204) {
-    await fetchSessions();
+    await refreshIfOffline();
   } else {
     alert('Failed to delete (status ' + res.status + ')');
   }
@@ -148,7 +259,7 @@ async function createSession(ev) {
     document.getElementById('session_msg').textContent = editingSessionId === null ? 'Session entry added ✓' : 'Session updated ✓';
     editingSessionId = null;
     document.getElementById('sessionFormSubmit').textContent = 'Log Session';
-    fetchSessions();
+    refreshIfOffline();
   } else {
     const txt = await res.text();
     document.getElementById('session_msg').textContent = 'Error: ' + txt;
@@ -169,9 +280,7 @@ window.addEventListener('DOMContentLoaded', () => {
     cancelBtn.onclick = resetSessionForm;
   }
 });
-async function fetchExercises() {
-  const res = await fetch('/exercises');
-  const data = await res.json();
+function renderExercises(data) {
   const tbody = document.querySelector('#exerciseTable tbody');
   tbody.innerHTML = '';
   data.forEach(ex => {
@@ -196,6 +305,8 @@ async function fetchExercises() {
   // Populate session exercise dropdown
   const sessionExercise = document.getElementById('session_exercise');
   if (sessionExercise) {
+    // Keep the choice of someone filling in the form during a live update
+    const selected = sessionExercise.value;
     sessionExercise.innerHTML = '';
     data.forEach(ex => {
       const opt = document.createElement('option');
@@ -203,27 +314,23 @@ async function fetchExercises() {
       opt.textContent = ex.name;
       sessionExercise.appendChild(opt);
     });
+    if (data.some(ex => String(ex.id) === selected)) {
+      sessionExercise.value = selected;
+    }
   }
-
-  // --- Pie chart for category distribution ---
-  renderCategoryPieChart(data);
 }
 
-// Pie chart rendering for exercise category distribution
+// Pie chart rendering for exercise category distribution (counts per category)
 let categoryPieChartInstance = null;
-function renderCategoryPieChart(exercises) {
+function renderCategoryPieChart(counts) {
   const ctx = document.getElementById('categoryPieChart');
   if (!ctx) return;
-  // Count categories
-  const counts = { strength: 0, mobility: 0, balance: 0 };
-  exercises.forEach(ex => {
-    if (counts[ex.category] !== undefined) counts[ex.category]++;
-  });
   const labels = ['Strength', 'Mobility', 'Balance'];
   const data = [counts.strength, counts.mobility, counts.balance];
-  // Destroy previous chart if exists
   if (categoryPieChartInstance) {
-    categoryPieChartInstance.destroy();
+    categoryPieChartInstance.data.datasets[0].data = data;
+    categoryPieChartInstance.update();
+    return;
   }
   categoryPieChartInstance = new Chart(ctx, {
     type: 'pie',
@@ -266,7 +373,7 @@ async function deleteExercise(id) {
   if (!ok) return;
   const res = await fetch(`/exercises/${id}`, { method: 'DELETE' });
   if (res.status === 204) {
-    await fetchExercises();
+    await refreshIfOffline();
   } else {
     alert('Failed to delete (status ' + res.status + ')');
   }
@@ -308,7 +415,7 @@ async function createOrUpdateExercise(ev) {
     document.getElementById('msg').textContent = editingExerciseId === null ? 'Saved ✓' : 'Updated ✓';
     editingExerciseId = null;
     document.getElementById('exerciseFormSubmit').textContent = 'Add Exercise';
-    fetchExercises();
+    refreshIfOffline();
   } else {
     const txt = await res.text();
     document.getElementById('msg').textContent = 'Error: ' + txt;
@@ -348,7 +455,7 @@ function resetExerciseForm() {
 }
 
 window.addEventListener('DOMContentLoaded', () => {
-  fetchExercises();
+  loadDashboard();
   // Attach new handler for form submit
   const form = document.getElementById('exerciseForm');
   if (form) {
@@ -374,23 +481,16 @@ window.addEventListener('DOMContentLoaded', () => {
   if (sessionForm) {
     sessionForm.onsubmit = createSession;
   }
-  fetchSessions();
-  renderPainLineChart();
 });
 
-async function fetchSessions() {
-  const res = await fetch('/sessions');
-  const data = await res.json();
-  // Get exercise names for mapping
-  const exRes = await fetch('/exercises');
-  const exData = await exRes.json();
-  const exMap = {};
-  exData.forEach(ex => { exMap[ex.id] = ex.name; });
-
+function renderSessions(data, total, exMap) {
+  const count = document.getElementById('session_count');
+  if (count) {
+    count.textContent = total > data.length ? `latest ${data.length} of ${total}` : '';
+  }
   const tbody = document.querySelector('#sessionTable tbody');
   tbody.innerHTML = '';
   data.forEach(s => {
-    console.log('Session data:', s); // Debug log
     const tr = document.createElement('tr');
     tr.innerHTML = `
       <td>${s.date}</td>
@@ -407,6 +507,4 @@ async function fetchSessions() {
     `;
     tbody.appendChild(tr);
   });
-  // Update chart
-  renderPainLineChart();
-}
\ No newline at end of file
+}
@@ -0,0 +1,122 @@
+"""Sync vs async (DB_ASYNC) request throughput at high concurrency.
+
+Starts uvicorn once per mode against a throwaway database, seeds it, then
+fires paged GET /sessions requests from a pool of concurrent httpx clients.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_async_mode.py --concurrency 500 --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(db_path, db_async):
+    port = free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        DB_ASYNC="true" if db_async else "false",
+        DB_POOL_SIZE="20",
+        DB_MAX_OVERFLOW="40",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--backlog", "4096"],
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(base + "/health", timeout=1)
+            return proc, base
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+async def drive(base, concurrency, total):
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        ex_id = (await client.post("/exercises", json={
+            "name": "Bench", "side": "both", "category": "strength",
+        })).json()["id"]
+        rows = [
+            {"exercise_id": ex_id, "date": f"2024-01-{(i % 28) + 1:02d}"}
+            for i in range(5000)
+        ]
+        await client.post("/sessions/bulk", json=rows)
+
+        latencies = []
+        failed = 0
+        queue = iter(range(total))
+
+        async def worker():
+            nonlocal failed
+            for _ in queue:
+                t0 = time.perf_counter()
+                try:
+                    r = await client.get(
+                        "/sessions", params={"limit": 50, "exercise_id": ex_id}
+                    )
+                except httpx.TransportError:  # e.g. reset under overload
+                    failed += 1
+                    continue
+                if r.is_success:
+                    latencies.append(time.perf_counter() - t0)
+                else:
+                    failed += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "failed": failed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'failed':>6}")
+    for db_async in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            proc, base = start_server(os.path.join(tmp, "bench.db"), db_async)
+            try:
+                r = asyncio.run(drive(base, args.concurrency, args.requests))
+            finally:
+                proc.terminate()
+                proc.wait()
+        name = "async" if db_async else "sync"
+        print(
+            f"{name:<6} {r['rps']:>8.0f} {r['p50_ms']:>8.1f}"
+            f" {r['p99_ms']:>8.1f} {r['failed']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
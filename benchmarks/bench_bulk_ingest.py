@@ -0,0 +1,79 @@
+"""Compare session ingest rate: per-row POST /sessions vs POST /sessions/bulk.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_bulk_ingest.py --rows 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+
+
+def make_client(db_path):
+    engine = create_engine(
+        f"sqlite:///{db_path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def rows_for(ex_id, n):
+    return [
+        {
+            "exercise_id": ex_id,
+            "date": f"2024-01-{(i % 28) + 1:02d}",
+            "sets": 3,
+            "reps": 10,
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = make_client(os.path.join(tmp, "bench.db"))
+        ex_id = client.post(
+            "/exercises",
+            json={"name": "Bench", "side": "both", "category": "strength"},
+        ).json()["id"]
+        rows = rows_for(ex_id, args.rows)
+
+        start = time.perf_counter()
+        for row in rows:
+            client.post("/sessions", json=row)
+        per_row = time.perf_counter() - start
+
+        start = time.perf_counter()
+        client.post("/sessions/bulk", json=rows)
+        bulk = time.perf_counter() - start
+
+    app.dependency_overrides.pop(get_db, None)
+    print(f"rows:               {args.rows}")
+    print(f"per-row POST:       {args.rows / per_row:10.0f} rows/sec")
+    print(f"POST /sessions/bulk:{args.rows / bulk:10.0f} rows/sec")
+    print(f"speedup:            {per_row / bulk:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""POST /sessions throughput with and without SESSION_GROUP_COMMIT.
+
+Starts uvicorn once per mode against a throwaway database and has
+``--writers`` concurrent clients log sessions as fast as they can, like a
+whole class saving at the end of a group session. Reports writes/s, latency,
+failed writes (e.g. "database is locked" past the busy timeout) and, in
+group-commit mode, the mean batch size from /metrics. GET /livez driven the
+same way gives the HTTP ceiling of the machine for comparison.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_group_commit.py --writers 200 --requests 4000
+    # rollback journal with an fsync per commit instead of WAL
+    PYTHONPATH=. python benchmarks/bench_group_commit.py --no-tuning
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.bench_async_mode import free_port
+
+
+def start_server(db_path, group_commit, tuning):
+    port = free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        SESSION_GROUP_COMMIT="true" if group_commit else "false",
+        SQLITE_TUNING="true" if tuning else "false",
+        DB_POOL_SIZE="20",
+        DB_MAX_OVERFLOW="40",
+        # Lock waits would otherwise flood the output
+        SLOW_QUERY_MS="100000",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--backlog", "4096"],
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(base + "/livez", timeout=1)
+            return proc, base
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+def metric(text, name):
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[1])
+    return 0.0
+
+
+async def drive(base, writers, total, livez=False):
+    limits = httpx.Limits(max_connections=writers, max_keepalive_connections=writers)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        ex_id = (await client.post("/exercises", json={
+            "name": "Bench", "side": "both", "category": "strength",
+        })).json()["id"]
+
+        latencies = []
+        failed = 0
+        queue = iter(range(total))
+
+        async def writer():
+            nonlocal failed
+            for i in queue:
+                t0 = time.perf_counter()
+                try:
+                    if livez:
+                        r = await client.get("/livez")
+                    else:
+                        r = await client.post("/sessions", json={
+                            "exercise_id": ex_id,
+                            "date": f"2024-03-{(i % 28) + 1:02d}",
+                            "sets": 3, "reps": 10, "pain_0_10": i % 11,
+                        })
+                except httpx.TransportError:  # e.g. reset under overload
+                    failed += 1
+                    continue
+                if r.is_success:
+                    latencies.append(time.perf_counter() - t0)
+                else:
+                    failed += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(writer() for _ in range(writers)))
+        elapsed = time.perf_counter() - start
+        metrics = (await client.get("/metrics")).text
+    latencies.sort()
+    batches = metric(metrics, "session_write_batch_size_count")
+    return {
+        "wps": len(latencies) / elapsed,
+        "failed": failed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "batch": metric(metrics, "session_write_batch_size_sum") / batches
+        if batches else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--no-tuning", action="store_true")
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':<13} {'writes/s':>9} {'p50 ms':>8} {'p99 ms':>8}"
+        f" {'failed':>6} {'batch':>6}"
+    )
+    modes = (("GET /livez", False, True), ("per request", False, False),
+             ("group commit", True, False))
+    for name, group_commit, livez in modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            proc, base = start_server(
+                os.path.join(tmp, "bench.db"), group_commit, not args.no_tuning
+            )
+            try:
+                r = asyncio.run(drive(base, args.writers, args.requests, livez))
+            finally:
+                proc.terminate()
+                proc.wait()
+        batch = f"{r['batch']:.1f}" if r["batch"] else "-"
+        print(
+            f"{name:<13} {r['wps']:>9.0f} {r['p50_ms']:>8.1f}"
+            f" {r['p99_ms']:>8.1f} {r['failed']:>6} {batch:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
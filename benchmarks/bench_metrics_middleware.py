@@ -0,0 +1,95 @@
+"""Per-request overhead of the metrics middleware, before and after.
+
+Drives a one-route FastAPI app directly over ASGI (no sockets) three ways:
+no middleware, the previous ``@app.middleware("http")`` implementation
+labelled by raw path, and app.metrics.MetricsMiddleware.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_metrics_middleware.py --requests 20000
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from app.metrics import MetricsMiddleware
+
+
+def base_app():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+def with_old_middleware():
+    app = base_app()
+    registry = CollectorRegistry()
+    count = Counter("old_requests_total", "", ["method", "path", "status"],
+                    registry=registry)
+    latency = Histogram("old_request_seconds", "", ["method", "path"],
+                        registry=registry)
+
+    @app.middleware("http")
+    async def metrics_middleware(request: Request, call_next):
+        start = time.perf_counter()
+        method, path = request.method, request.url.path
+        response = await call_next(request)
+        count.labels(method=method, path=path, status=str(response.status_code)).inc()
+        latency.labels(method=method, path=path).observe(time.perf_counter() - start)
+        return response
+
+    return app
+
+
+def with_new_middleware():
+    app = base_app()
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app, n):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for i in range(n):
+        path = f"/items/{i}"
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+            "root_path": "", "query_string": b"", "headers": [],
+            "server": ("test", 80), "client": ("test", 1234),
+        }
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    variants = {
+        "none": base_app(),
+        "old (raw path)": with_old_middleware(),
+        "new (route label)": with_new_middleware(),
+    }
+    baseline = None
+    for name, app in variants.items():
+        per_req = asyncio.run(drive(app, args.requests))
+        baseline = per_req if baseline is None else baseline
+        overhead = (per_req - baseline) * 1e6
+        print(f"{name:<18} {per_req * 1e6:8.1f} us/req  overhead {overhead:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Latency of the progress analytics over a multi-year daily history.
+
+Times GET /exercises/{id}/progress (the service call, which is what the
+route spends its time in) and the all-exercises batch variant.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_progress.py --years 5 --exercises 10
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.config import Settings
+from app.database import Base, make_engine
+from app.services import progress as progress_service
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--exercises", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    days = args.years * 365
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(
+            Settings(database_url=f"sqlite:///{os.path.join(tmp, 'prog.db')}")
+        )
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = SessionLocal()
+        exercises = [
+            models.Exercise(name=f"Bench {i}", side="both", category="strength")
+            for i in range(args.exercises)
+        ]
+        db.add_all(exercises)
+        db.flush()
+        start = date(2020, 1, 1)
+        db.bulk_insert_mappings(models.ExerciseSession, [
+            {"exercise_id": ex.id, "date": start + timedelta(days=d),
+             "sets": 3, "reps": 12, "pain_0_10": rng.randint(0, 10),
+             "rom_deg": 60 + d * 60 // days + rng.randint(-5, 5)}
+            for ex in exercises
+            for d in range(days)
+        ])
+        db.commit()
+
+        ex_id = exercises[0].id
+        single = best_of(
+            lambda: progress_service.exercise_progress(db, ex_id), args.repeat
+        )
+        batch = best_of(lambda: progress_service.all_progress(db), args.repeat)
+        db.close()
+        engine.dispose()
+
+    print(f"history: {days} daily sessions x {args.exercises} exercises")
+    print(f"single exercise: {single * 1000:8.1f} ms")
+    print(f"all exercises:   {batch * 1000:8.1f} ms  (one scan)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Per-row cost of serializing a session listing: old path vs fast path.
+
+old:  ORM objects -> response_model validation (from_attributes) ->
+      jsonable_encoder -> json.dumps, as FastAPI does for list[SessionOut]
+fast: plain row tuples -> dicts -> orjson.dumps (app.responses.json_response)
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_serialization.py --rows 10000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.orm import sessionmaker
+
+from app import models, schemas
+from app.config import Settings
+from app.database import Base, make_engine
+from app.services import sessions as session_service
+
+SESSION_LIST = TypeAdapter(list[schemas.SessionOut])
+
+
+def old_path(db):
+    rows = session_service.list_sessions(db)
+    validated = SESSION_LIST.validate_python(rows, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_path(db):
+    return orjson.dumps(session_service.list_session_rows(db))
+
+
+def best_of(fn, SessionLocal, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        db = SessionLocal()
+        start = time.perf_counter()
+        fn(db)
+        best = min(best, time.perf_counter() - start)
+        db.close()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(
+            Settings(database_url=f"sqlite:///{os.path.join(tmp, 'ser.db')}")
+        )
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = SessionLocal()
+        ex = models.Exercise(name="Bench", side="both", category="strength")
+        db.add(ex)
+        db.flush()
+        start = date(2015, 1, 1)
+        db.bulk_insert_mappings(models.ExerciseSession, [
+            {"exercise_id": ex.id, "date": start + timedelta(days=i % 3650),
+             "sets": 3, "reps": 12, "pain_0_10": i % 11, "rom_deg": 90 + i % 40}
+            for i in range(args.rows)
+        ])
+        db.commit()
+        db.close()
+
+        assert json.loads(old_path(SessionLocal())) == json.loads(
+            fast_path(SessionLocal())
+        )
+        old = best_of(old_path, SessionLocal, args.repeat)
+        fast = best_of(fast_path, SessionLocal, args.repeat)
+        engine.dispose()
+
+    print(f"rows: {args.rows}")
+    print(f"old  path: {old * 1000:8.1f} ms  {old / args.rows * 1e6:6.2f} us/row")
+    print(f"fast path: {fast * 1000:8.1f} ms  {fast / args.rows * 1e6:6.2f} us/row")
+    print(f"speedup:   {old / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
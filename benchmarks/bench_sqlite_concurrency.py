@@ -0,0 +1,127 @@
+"""Read throughput while writes are happening, default vs tuned SQLite engine.
+
+Runs reader threads (filtered session listings) next to writer threads
+(single-row inserts, one commit each) for a fixed duration, first with the
+stock journaling settings and then with WAL + pragmas from app.config.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_sqlite_concurrency.py --seconds 5
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.config import Settings
+from app.database import Base, make_engine
+from app.services import sessions as session_service
+
+
+def seed(SessionLocal, rows):
+    db = SessionLocal()
+    ex = models.Exercise(name="Bench", side="both", category="strength")
+    db.add(ex)
+    db.flush()
+    start = date(2020, 1, 1)
+    db.bulk_insert_mappings(
+        models.ExerciseSession,
+        [
+            {"exercise_id": ex.id, "date": start + timedelta(days=i % 1500)}
+            for i in range(rows)
+        ],
+    )
+    db.commit()
+    ex_id = ex.id
+    db.close()
+    return ex_id
+
+
+def run(cfg, readers, writers, seconds, rows):
+    engine = make_engine(cfg)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    ex_id = seed(SessionLocal, rows)
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def reader():
+        while not stop.is_set():
+            db = SessionLocal()
+            try:
+                session_service.list_sessions_page(db, exercise_id=ex_id, limit=50)
+                bump("reads")
+            except OperationalError:
+                bump("errors")
+            finally:
+                db.close()
+
+    def writer():
+        while not stop.is_set():
+            db = SessionLocal()
+            try:
+                db.add(models.ExerciseSession(exercise_id=ex_id, date=date.today()))
+                db.commit()
+                bump("writes")
+            except OperationalError:
+                db.rollback()
+                bump("errors")
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+    return {k: v / seconds for k, v in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Lock waits are the point here; logging each one with its query plan
+    # would bury the results
+    quiet = {"slow_query_ms": 100_000}
+    with tempfile.TemporaryDirectory() as tmp:
+        variants = {
+            "default": Settings(
+                database_url=f"sqlite:///{os.path.join(tmp, 'default.db')}",
+                sqlite_tuning=False,
+                **quiet,
+            ),
+            "wal+pragmas": Settings(
+                database_url=f"sqlite:///{os.path.join(tmp, 'tuned.db')}",
+                **quiet,
+            ),
+        }
+        print(f"{'variant':<12} {'reads/s':>10} {'writes/s':>10} {'errors/s':>10}")
+        for name, cfg in variants.items():
+            r = run(cfg, args.readers, args.writers, args.seconds, args.rows)
+            print(
+                f"{name:<12} {r['reads']:>10.0f} "
+                f"{r['writes']:>10.1f} {r['errors']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
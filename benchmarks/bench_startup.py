@@ -0,0 +1,76 @@
+"""Cold import and startup time of the app, as paid by each new worker.
+
+Each sample runs in a fresh interpreter so nothing is already imported:
+
+import:        ``import app.main``
+startup new:   import + create_app() + lifespan against an empty database
+startup warm:  the same against a database already at the current schema
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_startup.py --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = """
+import asyncio, os, sys, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+if sys.argv[1] != "import":
+    from app.config import Settings
+    application = app.main.create_app(Settings(database_url=os.environ["URL"]))
+
+    async def start():
+        async with application.router.lifespan_context(application):
+            pass
+
+    asyncio.run(start())
+t2 = time.perf_counter()
+print((t1 - t0) * 1000, (t2 - t0) * 1000)
+"""
+
+
+def sample(mode: str, url: str) -> tuple[float, float]:
+    # DATABASE_URL keeps the module-level engine away from ./rehab.db
+    env = dict(os.environ, URL=url, DATABASE_URL=url)
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, mode],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    imported, total = map(float, out.split())
+    return imported, total
+
+
+def report(label: str, values: list[float]) -> None:
+    print(
+        f"{label:14s} median {statistics.median(values):7.1f} ms"
+        f"   min {min(values):7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    imports, fresh, warm = [], [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.repeat):
+            url = f"sqlite:///{os.path.join(tmp, f'fresh{i}.db')}"
+            imports.append(sample("import", url)[0])
+            fresh.append(sample("startup", url)[1])
+            # The database was created by the previous run
+            warm.append(sample("startup", url)[1])
+
+    report("import", imports)
+    report("startup new", fresh)
+    report("startup warm", warm)
+
+
+if __name__ == "__main__":
+    main()
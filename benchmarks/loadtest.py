@@ -0,0 +1,217 @@
+"""In-process load test with comparable JSON output and regression gating.
+
+Seeds a database at a fixed scale (see benchmarks.seed), then drives the real
+FastAPI app through httpx's ASGI transport with concurrent clients against
+the list, filter, create, update and delete endpoints.
+
+Usage:
+    PYTHONPATH=. python -m benchmarks.loadtest --scale 100k --out run.json
+    PYTHONPATH=. python -m benchmarks.loadtest --scale 100k --baseline run.json
+
+Exits 1 when any scenario's throughput drops, or its p95 latency or error
+rate grows, by more than --threshold (default 10%) relative to the baseline.
+A baseline without errors tolerates none: failed requests are cheap and
+would otherwise pass as a speed-up. The baseline must come from a run at the
+same --scale and --concurrency.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.seed import END_DATE, SCALES, seed
+
+SCENARIOS = ("list", "filter", "create", "update", "delete")
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100)
+    else:
+        cuts = latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+    }
+
+
+def error_rate(summary: dict) -> float:
+    return summary.get("errors", 0) / summary["requests"] if summary["requests"] else 0
+
+
+# Runs differing in any of these are not comparable
+RUN_PARAMETERS = ("scale", "concurrency")
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of every metric that regressed past ``threshold``.
+
+    Raises ValueError if the baseline was run with different parameters.
+    """
+    mismatched = [
+        f"{key} {baseline.get(key)} != {current.get(key)}"
+        for key in RUN_PARAMETERS
+        if baseline.get(key) != current.get(key)
+    ]
+    if mismatched:
+        raise ValueError(
+            "baseline is from a different run: " + ", ".join(mismatched)
+        )
+    problems = []
+    for name, base in baseline.get("scenarios", {}).items():
+        cur = current["scenarios"].get(name)
+        if cur is None:
+            continue
+        if cur["rps"] < base["rps"] * (1 - threshold):
+            problems.append(f"{name}: rps {cur['rps']} < baseline {base['rps']}")
+        if cur["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            problems.append(
+                f"{name}: p95 {cur['p95_ms']}ms > baseline {base['p95_ms']}ms"
+            )
+        if error_rate(cur) > error_rate(base) * (1 + threshold):
+            problems.append(
+                f"{name}: error rate {error_rate(cur):.2%}"
+                f" > baseline {error_rate(base):.2%}"
+            )
+    return problems
+
+
+async def run_scenario(client, concurrency, total, make_request, on_response=None):
+    latencies, errors = [], 0
+    jobs = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in jobs:
+            method, url, body = make_request(i)
+            t0 = time.perf_counter()
+            r = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - t0)
+            if r.status_code >= 400:
+                errors += 1
+            elif on_response:
+                on_response(r)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def run(app, concurrency, total, rng_seed) -> dict:
+    rng = random.Random(rng_seed)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        ex_ids = [e["id"] for e in (await c.get("/exercises")).json()]
+        created: list[int] = []
+
+        def list_req(i):
+            return "GET", "/sessions?limit=50", None
+
+        def filter_req(i):
+            return "GET", (
+                f"/sessions?limit=100&exercise_id={rng.choice(ex_ids)}"
+                f"&from_date={END_DATE.replace(year=END_DATE.year - 1)}"
+                f"&to_date={END_DATE}"
+            ), None
+
+        def create_req(i):
+            return "POST", "/sessions", {
+                "exercise_id": rng.choice(ex_ids),
+                "date": str(END_DATE),
+                "sets": 3, "reps": 10, "pain_0_10": 2,
+            }
+
+        def update_req(i):
+            return "PUT", f"/sessions/{rng.choice(created)}", {"reps": 12}
+
+        def delete_req(i):
+            return "DELETE", f"/sessions/{created[i]}", None
+
+        builders = {
+            "list": list_req,
+            "filter": filter_req,
+            "create": create_req,
+            "update": update_req,
+            "delete": delete_req,
+        }
+        # Capture created ids so update/delete always hit existing rows
+        hooks = {"create": lambda r: created.append(r.json()["id"])}
+        results = {}
+        for name in SCENARIOS:
+            if name in ("update", "delete") and not created:
+                # rng.choice([]) would fail deep inside a worker instead
+                raise SystemExit(f"no sessions were created; cannot run {name}")
+            n = min(total, len(created)) if name == "delete" else total
+            out = await run_scenario(
+                c, concurrency, n, builders[name], hooks.get(name)
+            )
+            results[name] = summarize(*out)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--exercises", type=int, default=20)
+    parser.add_argument("--db", help="reuse/seed this file (default: temp file)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    tmp = None
+    db_path = args.db
+    if not db_path:
+        tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp.name, "loadtest.db")
+    # The app binds its engine from DATABASE_URL at import time
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    from sqlalchemy import create_engine
+
+    seed(create_engine(os.environ["DATABASE_URL"]), SCALES[args.scale], args.exercises)
+    from app.main import app
+
+    scenarios = asyncio.run(run(app, args.concurrency, args.requests, args.seed))
+    report = {
+        "scale": args.scale,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "python": sys.version.split()[0],
+        "scenarios": scenarios,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    if tmp:
+        tmp.cleanup()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            try:
+                problems = compare(report, json.load(f), args.threshold)
+            except ValueError as exc:
+                sys.exit(f"cannot compare: {exc}")
+        for p in problems:
+            print(f"REGRESSION {p}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
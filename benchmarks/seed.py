@@ -0,0 +1,89 @@
+"""Deterministic seed data at fixed scales for benchmarks and load tests.
+
+Usage:
+    PYTHONPATH=. python -m benchmarks.seed --scale 100k --db bench-100k.db
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, func, insert, select
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+# Fixed anchor so the same scale always produces the same rows
+END_DATE = date(2025, 1, 1)
+HISTORY_DAYS = 5 * 365
+CHUNK = 10_000
+
+
+def seed(engine, sessions: int, exercises: int = 20, rng_seed: int = 42) -> None:
+    """Create the schema and fill it unless it already holds ``sessions`` rows."""
+    # Imported lazily: app.config reads DATABASE_URL when first imported, and
+    # callers such as benchmarks.loadtest set it after importing this module.
+    from app import models
+    from app.database import Base
+    from app.migrations import run_migrations
+    from app.services.rollups import rebuild_rollups
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    with engine.begin() as conn:
+        existing = conn.scalar(
+            select(func.count()).select_from(models.ExerciseSession)
+        )
+        if existing == sessions:
+            return
+        if existing:
+            raise SystemExit(f"database has {existing} sessions; use a new file")
+
+    rng = random.Random(rng_seed)
+    categories = ["strength", "mobility", "balance"]
+    sides = ["left", "right", "both"]
+    with engine.begin() as conn:
+        ex_ids = conn.scalars(
+            insert(models.Exercise).returning(
+                models.Exercise.id, sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "name": f"Exercise {i}",
+                    "side": sides[i % 3],
+                    "category": categories[i % 3],
+                    "target_sets": 3,
+                    "target_reps": 10,
+                    "schedule_mask": rng.randrange(1, 128),
+                }
+                for i in range(exercises)
+            ],
+        ).all()
+        start = END_DATE - timedelta(days=HISTORY_DAYS)
+        for offset in range(0, sessions, CHUNK):
+            rows = []
+            for _ in range(min(CHUNK, sessions - offset)):
+                rows.append({
+                    "exercise_id": rng.choice(ex_ids),
+                    "date": start + timedelta(days=rng.randrange(HISTORY_DAYS)),
+                    "sets": rng.randint(1, 5),
+                    "reps": rng.randint(5, 20),
+                    "pain_0_10": rng.randint(0, 10),
+                    "rom_deg": rng.randint(40, 140),
+                })
+            conn.execute(insert(models.ExerciseSession), rows)
+        # The rows bypass the service layer, which keeps the daily rollups
+        # that /sessions/daily and /dashboard read
+        rebuild_rollups(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--exercises", type=int, default=20)
+    parser.add_argument("--db", required=True)
+    args = parser.parse_args()
+    engine = create_engine(f"sqlite:///{args.db}")
+    seed(engine, SCALES[args.scale], args.exercises)
+    print(f"seeded {args.db} with {SCALES[args.scale]} sessions")
+
+
+if __name__ == "__main__":
+    main()
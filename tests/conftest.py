@@ -3,7 +3,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.database import Base, get_db
+from app.database import Base, enable_foreign_keys, get_db
 import app.database as _app_db
 
 # Import models first so they register with Base, then import the FastAPI app
@@ -20,6 +20,7 @@ tmp_db_path = tmp_db_file.name
 tmp_db_file.close()
 TEST_DATABASE_URL = f"sqlite:///{tmp_db_path}"
 engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+enable_foreign_keys(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -53,3 +54,29 @@ def client():
         os.unlink(tmp_db_path)
     except Exception:
         pass
+
+
+@pytest.fixture
+def create_exercise(client):
+    """Create an exercise through the API and return its id."""
+    def create(name="Heel Raise", category="strength", side="both", **fields):
+        r = client.post("/exercises", json={
+            "name": name, "side": side, "category": category, **fields,
+        })
+        assert r.status_code == 200, r.text
+        return r.json()["id"]
+
+    return create
+
+
+@pytest.fixture
+def create_session(client):
+    """Log a session through the API and return its JSON."""
+    def create(exercise_id, date, **fields):
+        r = client.post("/sessions", json={
+            "exercise_id": exercise_id, "date": date, **fields,
+        })
+        assert r.status_code == 200, r.text
+        return r.json()
+
+    return create
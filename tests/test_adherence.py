@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from prometheus_client import REGISTRY
+
+from app import models
+from app.database import SessionLocal
+
+RANGE = {"from": "2030-01-06", "to": "2030-01-19"}
+
+
+def sample(name):
+    return REGISTRY.get_sample_value(name, {"cache": "adherence"}) or 0
+
+
+def report(client):
+    r = client.get("/adherence", params=RANGE)
+    assert r.status_code == 200
+    return r.json()
+
+
+def entry(body, ex):
+    return next(e for e in body["exercises"] if e["exercise_id"] == ex)
+
+
+def test_adherence_per_exercise_and_streaks(client, create_exercise, create_session):
+    # Mon + Wed over two weeks: 7th, 9th, 14th, 16th
+    ex = create_exercise("Adherence A", schedule_dow=[1, 3])
+    # Two sessions on the 9th count once; the 10th is not scheduled
+    for day in ("2030-01-07", "2030-01-09", "2030-01-09", "2030-01-10", "2030-01-14"):
+        create_session(ex, day)
+
+    body = report(client)
+    assert body["from_date"] == RANGE["from"]
+    a = entry(body, ex)
+    assert a["scheduled_days"] == 4
+    assert a["completed_days"] == 3
+    assert a["adherence"] == 0.75
+    assert a["current_streak"] == 0
+    assert a["longest_streak"] == 3
+    assert body["scheduled_days"] == sum(
+        e["scheduled_days"] for e in body["exercises"]
+    )
+
+    unscheduled = create_exercise("Adherence none", schedule_dow=[])
+    assert entry(report(client), unscheduled)["adherence"] is None
+
+    create_session(ex, "2030-01-16")
+    a = entry(report(client), ex)
+    assert a["completed_days"] == 4
+    assert a["current_streak"] == a["longest_streak"] == 4
+
+
+def test_adherence_cache_invalidated_by_writes(client, create_exercise, create_session):
+    ex = create_exercise("Adherence B", schedule_dow=[0])  # Sundays: 6th, 13th
+    report(client)
+    misses = sample("app_cache_misses_total")
+    assert entry(report(client), ex)["completed_days"] == 0
+    assert sample("app_cache_misses_total") == misses
+
+    # Session write
+    create_session(ex, "2030-01-13")
+    assert entry(report(client), ex)["completed_days"] == 1
+    # Schedule change
+    client.put(f"/exercises/{ex}", json={"schedule_dow": [0, 6]})
+    assert entry(report(client), ex)["scheduled_days"] == 4
+    assert sample("app_cache_misses_total") == misses + 2
+
+
+def test_adherence_rejects_inverted_range(client):
+    r = client.get("/adherence", params={"from": "2030-02-01", "to": "2030-01-01"})
+    assert r.status_code == 400
+
+
+def test_adherence_starts_when_the_exercise_was_added(
+    client, create_exercise, create_session
+):
+    ex = create_exercise("Adherence late", schedule_dow=[1, 3])  # Mon + Wed
+    db = SessionLocal()
+    db.get(models.Exercise, ex).created_at = datetime(2030, 1, 13, 9, 30)
+    db.commit()
+    db.close()
+    for day in ("2030-01-14", "2030-01-16"):
+        create_session(ex, day)
+    # 7th and 9th were before it existed
+    a = entry(report(client), ex)
+    assert (a["scheduled_days"], a["completed_days"]) == (2, 2)
+    assert a["adherence"] == 1.0
+
+
+def test_adherence_rejects_long_range(client):
+    r = client.get("/adherence", params={"from": "0001-01-01", "to": "9999-12-31"})
+    assert r.status_code == 400
+    r = client.get("/adherence", params={"from": "2027-01-01", "to": "2029-12-31"})
+    assert r.status_code == 200
@@ -0,0 +1,90 @@
+import shutil
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.assets import STATIC_DIR, AssetFiles, accepted_encodings, build
+
+
+def built_app(tmp_path):
+    static = tmp_path / "static"
+    shutil.copytree(STATIC_DIR, static, ignore=shutil.ignore_patterns("dist"))
+    manifest = build(static)
+    app = FastAPI()
+    files = AssetFiles(directory=static)
+    app.mount("/static", files)
+
+    @app.get("/ui")
+    def ui(request: Request):
+        return files.page("ui.html", request.scope)
+
+    return TestClient(app), static, manifest
+
+
+def test_build_writes_hashed_precompressed_assets(tmp_path):
+    _, static, manifest = built_app(tmp_path)
+    js = manifest["ui.js"]
+    assert js.startswith("ui.") and js.endswith(".js") and len(js) == len("ui..js") + 12
+    for name in (js, manifest["styles.css"], "ui.html"):
+        for suffix in ("", ".gz", ".br"):
+            assert (static / "dist" / (name + suffix)).exists()
+    html = (static / "dist" / "ui.html").read_text()
+    assert f'src="/static/dist/{js}"' in html
+    assert f'href="/static/dist/{manifest["styles.css"]}"' in html
+    assert "/static/ui.js" not in html
+    # Same input, same names
+    assert build(static) == manifest
+
+
+def test_negotiates_encoding_and_caches_hashed_assets(tmp_path):
+    client, static, manifest = built_app(tmp_path)
+    url = f"/static/dist/{manifest['ui.js']}"
+    source = (static / "ui.js").read_bytes()
+
+    cases = (("gzip, br", "br"), ("gzip", "gzip"), ("br;q=0, gzip", "gzip"))
+    for accept, coding in cases:
+        r = client.get(url, headers={"Accept-Encoding": accept})
+        assert r.headers["content-encoding"] == coding
+        assert r.headers["content-type"].split(";")[0] in (
+            "text/javascript", "application/javascript"
+        )
+        assert r.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert r.headers["vary"] == "Accept-Encoding"
+        assert r.content == source
+    r = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers
+    assert r.content == source
+
+    # Unhashed source files stay available but must revalidate
+    r = client.get("/static/ui.js")
+    assert r.headers["cache-control"] == "no-cache"
+
+
+def test_repeat_page_load_sends_no_bytes(tmp_path):
+    client, static, _ = built_app(tmp_path)
+    first = client.get("/ui", headers={"Accept-Encoding": "br"})
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+    revalidate = {"Accept-Encoding": "br", "If-None-Match": first.headers["etag"]}
+    again = client.get("/ui", headers=revalidate)
+    assert again.status_code == 304
+    assert again.content == b""
+
+    # A rebuild (new mtimes) of unchanged sources keeps the ETag
+    build(static)
+    assert client.get("/ui", headers=revalidate).status_code == 304
+    gzipped = client.get("/ui", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["etag"] != first.headers["etag"]
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate, br;q=0.5") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("br;q=0, gzip;q=bad") == set()
+    assert accepted_encodings("") == set()
+
+
+def test_ui_served_without_a_build(client):
+    r = client.get("/ui")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/html")
+    assert "Knee Rehab Tracker" in r.text
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.config import Settings
+from app.database import Base, get_async_db, get_db, make_async_engine, make_engine
+from app.routers import exercises, exercises_async, sessions, sessions_async
+from app.schemas import ExerciseCreate, SessionCreate
+from app.services import exercises_async as exercise_service
+from app.services import sessions_async as session_service
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    cfg = Settings(database_url=f"sqlite:///{tmp_path / 'async.db'}")
+    sync_engine = make_engine(cfg)
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+    return cfg
+
+
+def test_async_services_roundtrip(cfg):
+    async def scenario():
+        engine = make_async_engine(cfg)
+        factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        async with factory() as db:
+            ex = await exercise_service.create_exercise(db, ExerciseCreate(
+                name="Async Squat", side="left", category="strength",
+                schedule_dow=[2, 4],
+            ))
+            assert ex.schedule_dow == [2, 4]
+            for day in ("2024-01-01", "2024-01-02", "2024-01-03"):
+                s = await session_service.create_session(
+                    db, SessionCreate(exercise_id=ex.id, date=day)
+                )
+                assert s.id
+            assert await session_service.create_session(
+                db, SessionCreate(exercise_id=999999, date="2024-01-01")
+            ) is None
+            page, cursor = await session_service.list_sessions_page(
+                db, exercise_id=ex.id, limit=2
+            )
+            assert [str(s["date"]) for s in page] == ["2024-01-03", "2024-01-02"]
+            rest, cursor = await session_service.list_sessions_page(
+                db, exercise_id=ex.id, limit=2, cursor=cursor
+            )
+            assert [str(s["date"]) for s in rest] == ["2024-01-01"]
+            assert cursor is None
+            assert await exercise_service.delete_exercise(db, ex.id)
+            assert await session_service.list_sessions(db, exercise_id=ex.id) == []
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_async_routes_shadow_sync_routes(cfg):
+    app = FastAPI()
+    app.include_router(exercises_async.router)
+    app.include_router(sessions_async.router)
+    app.include_router(exercises.router)
+    app.include_router(sessions.router)
+
+    engine = make_async_engine(cfg)
+    factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    # Only the fall-through sync routes use this; same database file
+    sync_engine = make_engine(cfg)
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    def override_get_db():
+        with Session(sync_engine) as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = override_get_db
+
+    with TestClient(app) as client:
+        r = client.post("/exercises", json={
+            "name": "Async Route", "side": "both", "category": "balance",
+        })
+        assert r.status_code == 200
+        ex_id = r.json()["id"]
+        r = client.post("/sessions", json={"exercise_id": ex_id, "date": "2024-02-01"})
+        assert r.status_code == 200
+        sid = r.json()["id"]
+        assert client.get(f"/sessions/{sid}").json()["date"] == "2024-02-01"
+        assert client.get("/sessions?limit=1").json()["next_cursor"] is None
+        # Not defined on the async router: served by the sync one
+        r = client.get(f"/sessions/series?exercise_id={ex_id}")
+        assert r.status_code == 200
+        assert r.json()[0]["count"] == 1
+        assert client.delete(f"/exercises/{ex_id}").status_code == 204
+        assert client.get(f"/exercises/{ex_id}").status_code == 404
+        client.portal.call(engine.dispose)
+    sync_engine.dispose()
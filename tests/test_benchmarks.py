@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import create_engine
+
+from benchmarks.loadtest import compare, summarize
+from benchmarks.seed import seed
+
+
+def test_seed_is_deterministic_and_idempotent(tmp_path):
+    dumps = []
+    for name in ("a.db", "b.db"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        seed(engine, sessions=50, exercises=3)
+        seed(engine, sessions=50, exercises=3)
+        with engine.connect() as conn:
+            dumps.append(conn.exec_driver_sql(
+                "SELECT exercise_id, date, sets, reps, pain_0_10, rom_deg "
+                "FROM sessions ORDER BY id"
+            ).all())
+            rolled_up = conn.exec_driver_sql(
+                "SELECT sum(session_count) FROM session_daily_rollup"
+            ).scalar()
+        engine.dispose()
+        assert rolled_up == 50
+    assert len(dumps[0]) == 50
+    assert dumps[0] == dumps[1]
+
+
+def test_compare_flags_regressions():
+    base = {"scenarios": {"list": summarize([0.010] * 50 + [0.020] * 50, 0, 1.0)}}
+    same = {"scenarios": {"list": dict(base["scenarios"]["list"])}}
+    assert compare(same, base, 0.10) == []
+
+    slower = {"scenarios": {"list": summarize([0.030] * 100, 0, 2.0)}}
+    problems = compare(slower, base, 0.10)
+    assert any("rps" in p for p in problems)
+    assert any("p95" in p for p in problems)
+    assert not any("error rate" in p for p in problems)
+
+    # Failing fast is not an improvement
+    failing = {"scenarios": {"list": summarize([0.001] * 100, 5, 0.1)}}
+    assert compare(failing, base, 0.10) == ["list: error rate 5.00% > baseline 0.00%"]
+
+    other_scale = dict(same, scale="100k", concurrency=50)
+    with pytest.raises(ValueError, match="scale 1k != 100k"):
+        compare(other_scale, dict(base, scale="1k", concurrency=50), 0.10)
@@ -0,0 +1,54 @@
+from prometheus_client import REGISTRY
+
+from app.cache import bump_version, get_version
+from app.database import SessionLocal
+from app.schemas import ExerciseCreate, ExerciseUpdate
+from app.services import exercises as exercise_service
+
+
+def sample(name):
+    return REGISTRY.get_sample_value(name, {"cache": "exercise_catalog"}) or 0
+
+
+def test_exercise_catalog_cache_hits_and_invalidation():
+    db = SessionLocal()
+    try:
+        ex = exercise_service.create_exercise(db, ExerciseCreate(
+            name="Cached", side="left", category="mobility", schedule_dow=[1],
+        ))
+        exercise_service.list_exercises(db)
+        hits, misses = sample("app_cache_hits_total"), sample("app_cache_misses_total")
+        assert exercise_service.get_exercise(db, ex.id).name == "Cached"
+        assert sample("app_cache_hits_total") == hits + 1
+        assert sample("app_cache_misses_total") == misses
+
+        version = get_version(db, "exercises")
+        exercise_service.update_exercise(db, ex.id, ExerciseUpdate(name="Renamed"))
+        assert get_version(db, "exercises") == version + 1
+        assert exercise_service.get_exercise(db, ex.id).name == "Renamed"
+
+        assert exercise_service.delete_exercise(db, ex.id)
+        assert exercise_service.get_exercise(db, ex.id) is None
+    finally:
+        db.close()
+
+
+def test_exercise_catalog_detects_writes_from_other_workers():
+    db = SessionLocal()
+    try:
+        exercise_service.list_exercises(db)
+        misses = sample("app_cache_misses_total")
+        # Another process bumping the version without touching our cache
+        bump_version(db, "exercises")
+        db.commit()
+        exercise_service.list_exercises(db)
+        assert sample("app_cache_misses_total") == misses + 1
+    finally:
+        db.close()
+
+
+def test_cache_counters_exported(client):
+    client.get("/exercises")
+    r = client.get("/metrics")
+    assert "app_cache_hits_total" in r.text
+    assert "app_cache_misses_total" in r.text
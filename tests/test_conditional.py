@@ -0,0 +1,53 @@
+from datetime import date
+
+from sqlalchemy import event
+
+import app.database as app_db
+
+
+def test_exercises_etag_roundtrip(client, create_exercise):
+    r = client.get("/exercises")
+    etag = r.headers["etag"]
+    assert r.headers["cache-control"] == "private, no-cache"
+
+    r = client.get("/exercises", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+
+    ex_id = create_exercise("ETag Ex", "balance", side="left")
+    r = client.get("/exercises", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+
+    r = client.get(f"/exercises/{ex_id}")
+    item_etag = r.headers["etag"]
+    r = client.get(f"/exercises/{ex_id}", headers={"If-None-Match": item_etag})
+    assert r.status_code == 304
+
+
+def test_sessions_304_skips_row_queries(client, create_exercise, create_session):
+    ex_id = create_exercise("ETag Sessions")
+    sid = create_session(ex_id, date.today().isoformat())["id"]
+
+    etag = client.get("/sessions").headers["etag"]
+    assert client.get(f"/sessions/{sid}").headers["etag"] == etag
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(app_db.engine, "before_cursor_execute", record)
+    try:
+        r = client.get("/sessions", headers={"If-None-Match": f'W/{etag}, "x"'})
+    finally:
+        event.remove(app_db.engine, "before_cursor_execute", record)
+    assert r.status_code == 304
+    assert any("table_versions" in s for s in statements)
+    assert not any("FROM sessions" in s for s in statements)
+
+    client.put(f"/sessions/{sid}", json={"reps": 9})
+    r = client.get(f"/sessions/{sid}", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["reps"] == 9
@@ -0,0 +1,60 @@
+from sqlalchemy import event
+
+import app.database as app_db
+
+
+def dashboard(client, **params):
+    r = client.get("/dashboard", params=params)
+    assert r.status_code == 200
+    return r
+
+
+def count_statements(fn):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(app_db.engine, "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(app_db.engine, "before_cursor_execute", listener)
+    return statements
+
+
+def test_dashboard_matches_individual_endpoints(
+    client, create_exercise, create_session
+):
+    ex = create_exercise("Dashboard A", "balance")
+    for day, pain in (("2031-03-01", 2), ("2031-03-01", 4), ("2031-03-02", None)):
+        create_session(ex, day, pain_0_10=pain)
+
+    body = dashboard(client, limit=2).json()
+    assert body["exercises"] == client.get("/exercises").json()
+    all_sessions = client.get("/sessions").json()
+    assert body["recent_sessions"] == all_sessions[:2]
+    assert body["session_count"] == len(all_sessions)
+    categories = [e["category"] for e in body["exercises"]]
+    assert body["categories"] == {
+        c: categories.count(c) for c in ("strength", "mobility", "balance")
+    }
+    days = [d for d in body["daily"] if d["exercise_id"] == ex]
+    assert [d["date"] for d in days] == ["2031-03-01", "2031-03-02"]
+    assert days[0]["pain_mean"] == 3 and days[0]["session_count"] == 2
+    assert days[1]["pain_mean"] is None
+
+
+def test_dashboard_queries_and_revalidation(client, create_exercise):
+    create_exercise("Dashboard B", "strength")
+    # First load rebuilds: versions, exercise catalog, sessions, rollups
+    statements = count_statements(lambda: dashboard(client, limit=3))
+    assert len(statements) <= 4
+    # Cached body: only the version lookup
+    assert len(count_statements(lambda: dashboard(client, limit=3))) == 1
+
+    etag = dashboard(client, limit=3).headers["etag"]
+    r = client.get("/dashboard", params={"limit": 3}, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+    create_exercise("Dashboard C", "mobility")
+    r = client.get("/dashboard", params={"limit": 3}, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert "Dashboard C" in [e["name"] for e in r.json()["exercises"]]
@@ -0,0 +1,39 @@
+from app.config import Settings
+from app.database import make_engine
+
+
+def test_settings_from_env():
+    cfg = Settings.from_env({
+        "DATABASE_URL": "sqlite:///./other.db",
+        "DB_POOL_SIZE": "12",
+        "DB_POOL_TIMEOUT": "2.5",
+        "SQLITE_TUNING": "false",
+    })
+    assert cfg.database_url == "sqlite:///./other.db"
+    assert cfg.db_pool_size == 12
+    assert cfg.db_pool_timeout == 2.5
+    assert cfg.sqlite_tuning is False
+    assert cfg.db_max_overflow == Settings().db_max_overflow
+
+
+def test_sqlite_engine_pragmas(tmp_path):
+    cfg = Settings(
+        database_url=f"sqlite:///{tmp_path / 'tuned.db'}",
+        db_pool_size=3,
+        sqlite_busy_timeout_ms=1234,
+    )
+    engine = make_engine(cfg)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 1234
+        cache_size = conn.exec_driver_sql("PRAGMA cache_size").scalar()
+        assert cache_size == -cfg.sqlite_cache_size_kib
+    assert engine.pool.size() == 3
+    engine.dispose()
+
+
+def test_memory_sqlite_engine_skips_pool_args():
+    engine = make_engine(Settings(database_url="sqlite:///:memory:"))
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT 1").scalar() == 1
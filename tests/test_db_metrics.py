@@ -0,0 +1,68 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc, text
+
+from app.config import Settings
+from app.db_metrics import fingerprint, instrument_engine, normalize
+from app.main import create_app
+
+
+def test_fingerprint_ignores_literals_and_in_list_length():
+    a = "SELECT id FROM sessions WHERE exercise_id IN (?, ?, ?) AND date > '2024-01-01'"
+    b = "SELECT  id FROM sessions\nWHERE exercise_id IN (?, ?) AND date > '2023-05-06'"
+    assert normalize(a) == normalize(b) == (
+        "SELECT id FROM sessions WHERE exercise_id IN (...) AND date > ?"
+    )
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint(a).startswith("SELECT sessions ")
+    assert fingerprint("UPDATE table_versions SET version=?").startswith(
+        "UPDATE table_versions "
+    )
+
+
+def test_debug_headers_caller_labels_and_slow_log(tmp_path, caplog):
+    cfg = Settings(
+        database_url=f"sqlite:///{tmp_path / 'q.db'}", debug=True, slow_query_ms=0
+    )
+    with TestClient(create_app(cfg)) as c:
+        ex = c.post("/exercises", json={
+            "name": "Instrumented", "side": "left", "category": "balance",
+        }).json()["id"]
+        c.post("/sessions", json={"exercise_id": ex, "date": "2024-02-01"})
+        with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+            r = c.get("/sessions", params={"exercise_id": ex})
+    assert r.status_code == 200
+    assert int(r.headers["x-db-queries"]) >= 1
+    assert float(r.headers["x-db-time-ms"]) >= 0
+
+    slow = [rec.getMessage() for rec in caplog.records]
+    listing = next(m for m in slow if "caller=sessions.list_session_rows" in m)
+    assert "FROM sessions" in listing
+    assert "plan:" in listing and "ix_sessions_exercise_date_id" in listing
+
+    counts = [
+        s for metric in REGISTRY.collect()
+        if metric.name == "db_query_duration_seconds"
+        for s in metric.samples
+        if s.name.endswith("_count")
+        and s.labels["caller"] == "sessions.list_session_rows"
+    ]
+    assert counts and counts[0].value >= 1
+
+
+def test_query_headers_off_by_default(client):
+    assert "x-db-queries" not in client.get("/exercises").headers
+
+
+def test_failed_statements_leave_nothing_on_the_connection():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, Settings())
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(exc.OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+        assert "query_start" not in conn.info
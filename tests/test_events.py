@@ -0,0 +1,168 @@
+import asyncio
+
+import orjson
+
+from app.events import EventBus, bus
+from app.main import app as fastapi_app
+
+
+def test_bus_resume_reset_and_overflow():
+    async def scenario():
+        b = EventBus(history=3, queue_size=4)
+        first = b.publish("a", {"n": 1})
+        for n in (2, 3):
+            b.publish("a", {"n": n})
+
+        queue, backlog, current = b.subscribe(first.id)
+        assert [e.data for e in backlog] == [b'{"n":2}', b'{"n":3}']
+        assert current == b.last_id
+        b.publish("a", {"n": 4})
+        await asyncio.sleep(0)
+        assert (await queue.get()).data == b'{"n":4}'
+
+        def backlog(last_id):
+            q, events, _ = b.subscribe(last_id)
+            b.unsubscribe(q)
+            return events
+
+        # Older than the history, unknown epoch, malformed: cannot resume
+        assert [e.data for e in backlog(first.id)] == [
+            b'{"n":2}', b'{"n":3}', b'{"n":4}'
+        ]
+        b.publish("a", {"n": 5})
+        await asyncio.sleep(0)
+        assert backlog(first.id) is None
+        assert backlog("feedface-1") is None
+        assert backlog("garbage") is None
+        assert backlog(None) == []
+
+        # A subscriber that stops reading is cut off with a final None
+        for n in range(10):
+            b.publish("a", {"n": n})
+        await asyncio.sleep(0)
+        items = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert items[-1] is None and len(items) == 4
+        assert queue not in b._subscribers
+
+    asyncio.run(scenario())
+
+
+def test_bus_delivers_concurrent_publishes_in_order():
+    async def scenario():
+        b = EventBus(queue_size=1000)
+        queue, _, _ = b.subscribe()
+        loop = asyncio.get_running_loop()
+
+        def publish_many():
+            for n in range(200):
+                b.publish("a", {"n": n})
+
+        await asyncio.gather(
+            *(loop.run_in_executor(None, publish_many) for _ in range(4))
+        )
+        await asyncio.sleep(0)
+        seqs = [int(queue.get_nowait().id.split("-")[1]) for _ in range(800)]
+        assert seqs == list(range(1, 801))
+
+    asyncio.run(scenario())
+
+
+def published_since(last_id):
+    async def read():
+        queue, backlog, _ = bus.subscribe(last_id)
+        bus.unsubscribe(queue)
+        return backlog
+
+    return asyncio.run(read())
+
+
+def test_service_writes_are_published(client, create_session):
+    start = bus.last_id
+    ex = client.post("/exercises", json={
+        "name": "Events A", "side": "left", "category": "mobility",
+    }).json()
+    s = create_session(ex["id"], "2032-05-01", pain_0_10=6)
+    client.put(f"/sessions/{s['id']}", json={"date": "2032-05-02"})
+    client.delete(f"/sessions/{s['id']}")
+    client.delete(f"/exercises/{ex['id']}")
+
+    events = [(e.type, orjson.loads(e.data)) for e in published_since(start)]
+    assert [t for t, _ in events] == [
+        "exercise.created", "session.created", "session.updated",
+        "session.deleted", "exercise.deleted",
+    ]
+    assert events[0][1]["exercise"] == ex
+    assert events[1][1]["session"] == s
+    assert events[1][1]["daily"][0]["pain_mean"] == 6
+    # The move empties the old day and fills the new one
+    moved = {d["date"]: d["session_count"] for d in events[2][1]["daily"]}
+    assert moved == {"2032-05-01": 0, "2032-05-02": 1}
+    assert events[3][1]["daily"][0]["session_count"] == 0
+    assert events[4][1] == {"id": ex["id"]}
+
+
+def test_dashboard_reports_feed_position(client):
+    r = client.get("/dashboard")
+    assert r.headers["x-last-event-id"] == bus.last_id
+    etag = r.headers["etag"]
+    r = client.get("/dashboard", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["x-last-event-id"] == bus.last_id
+
+
+async def read_stream(headers, until, during=None):
+    """Run GET /events over raw ASGI until ``until`` is in the body."""
+    disconnect = asyncio.Event()
+    body = bytearray()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+            if during and b"retry:" in body:
+                during()
+            if until in body:
+                disconnect.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/events", "raw_path": b"",
+        "root_path": "", "query_string": b"", "server": ("test", 80),
+        "client": ("test", 1), "app": fastapi_app,
+        "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+    }
+    await asyncio.wait_for(fastapi_app(scope, receive, send), 5)
+    return bytes(body)
+
+
+def test_events_stream_resumes_and_delivers_live():
+    async def scenario():
+        first = bus.publish("test.before", {"n": 1})
+        missed = bus.publish("test.before", {"n": 2})
+        live = []
+
+        def publish_live():
+            if not live:
+                live.append(bus.publish("test.live", {"n": 3}))
+
+        body = await read_stream(
+            {"last-event-id": first.id}, b"test.live", during=publish_live
+        )
+        assert body.startswith(b"retry: ")
+        assert missed.encode() in body and first.encode() not in body
+        assert live[0].encode() in body
+
+        body = await read_stream({"last-event-id": "0-1"}, b"event: reset")
+        assert f"id: {bus.last_id}\nevent: reset".encode() in body
+
+    asyncio.run(scenario())
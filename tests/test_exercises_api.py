@@ -1,3 +1,4 @@
+from datetime import date
 
 
 def test_exercises_crud_flow(client):
@@ -50,3 +51,55 @@ def test_create_invalid_exercise(client):
     payload = {"name": "A", "side": "left", "category": "strength"}
     r = client.post("/exercises", json=payload)
     assert r.status_code == 422
+
+
+def test_due_exercises_by_weekday(client):
+    tue = client.post("/exercises", json={
+        "name": "Tuesday Only", "side": "left", "category": "mobility",
+        "schedule_dow": [2],
+    }).json()
+    assert tue["schedule_dow"] == [2]
+    weekend = client.post("/exercises", json={
+        "name": "Weekend", "side": "both", "category": "balance",
+        "schedule_dow": [6, 0],
+    }).json()
+    assert weekend["schedule_dow"] == [0, 6]
+
+    # 2024-01-02 is a Tuesday, 2024-01-07 a Sunday
+    due = {e["id"] for e in client.get("/exercises/due?date=2024-01-02").json()}
+    assert tue["id"] in due and weekend["id"] not in due
+    due = {e["id"] for e in client.get("/exercises/due?date=2024-01-07").json()}
+    assert weekend["id"] in due and tue["id"] not in due
+
+
+def test_due_exercises_etag_changes_with_today(client, monkeypatch):
+    from app.routers import exercises as exercises_router
+
+    class Today(date):
+        value = date(2024, 1, 2)
+
+        @classmethod
+        def today(cls):
+            return cls.value
+
+    monkeypatch.setattr(exercises_router, "date", Today)
+    client.post("/exercises", json={
+        "name": "Tuesday Stretch", "side": "left", "category": "mobility",
+        "schedule_dow": [2],
+    })
+    r = client.get("/exercises/due")
+    assert "Tuesday Stretch" in {e["name"] for e in r.json()}
+    etag = r.headers["etag"]
+    r = client.get("/exercises/due", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+    Today.value = date(2024, 1, 3)
+    r = client.get("/exercises/due", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert "Tuesday Stretch" not in {e["name"] for e in r.json()}
+
+    r = client.post("/exercises", json={
+        "name": "Bad Day", "side": "left", "category": "mobility",
+        "schedule_dow": [7],
+    })
+    assert r.status_code == 422
@@ -0,0 +1,149 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app import models
+from app.config import Settings
+from app.database import SessionLocal
+from app.main import create_app
+from app.schemas import ExerciseCreate, SessionCreate
+from app.services import exercises as exercise_service
+from app.services.group_commit import GroupCommitWriter
+
+
+def batch_stats():
+    count = REGISTRY.get_sample_value("session_write_batch_size_count") or 0
+    total = REGISTRY.get_sample_value("session_write_batch_size_sum") or 0
+    return count, total
+
+
+def test_writer_batches_and_answers_each_caller():
+    db = SessionLocal()
+    ex = exercise_service.create_exercise(db, ExerciseCreate(
+        name="Group commit", side="left", category="strength",
+    ))
+    payloads = [
+        SessionCreate(exercise_id=ex.id, date=f"2033-01-{i % 28 + 1:02d}", reps=i)
+        for i in range(25)
+    ]
+    payloads[7] = SessionCreate(exercise_id=999_999, date="2033-01-01")
+
+    writer = GroupCommitWriter(SessionLocal, max_batch=10, window_s=0.05)
+    before = batch_stats()
+    # Queued before the writer runs, so the batches are exactly 10, 10, 5
+    futures = [writer.submit(p) for p in payloads]
+    writer.start()
+    results = [f.result(timeout=10) for f in futures]
+    writer.stop()
+
+    assert results[7] is None
+    created = [r for r in results if r is not None]
+    assert len({r["id"] for r in created}) == 24
+    assert [r["reps"] for r in created] == [i for i in range(25) if i != 7]
+    stored = db.query(models.ExerciseSession).filter_by(exercise_id=ex.id).count()
+    assert stored == 24
+    rollup = db.get(models.SessionDailyRollup, (ex.id, payloads[0].date))
+    assert rollup.session_count == 1
+    db.close()
+    count, total = batch_stats()
+    assert (count - before[0], total - before[1]) == (3, 25)
+
+
+def test_group_commit_mode_serves_concurrent_posts(tmp_path):
+    cfg = Settings(
+        database_url=f"sqlite:///{tmp_path / 'group.db'}",
+        session_group_commit=True,
+    )
+    with TestClient(create_app(cfg)) as c:
+        ex_id = c.post("/exercises", json={
+            "name": "Class", "side": "both", "category": "balance",
+        }).json()["id"]
+
+        def post(i):
+            return c.post("/sessions", json={
+                "exercise_id": ex_id, "date": "2033-02-01", "pain_0_10": i % 11,
+            })
+
+        with ThreadPoolExecutor(20) as pool:
+            responses = list(pool.map(post, range(60)))
+        assert all(r.status_code == 200 for r in responses)
+        assert len({r.json()["id"] for r in responses}) == 60
+        daily = c.get("/sessions/daily").json()
+        assert daily[0]["session_count"] == 60
+
+        r = c.post("/sessions", json={"exercise_id": 999_999, "date": "2033-02-01"})
+        assert r.status_code == 400
+
+
+def test_group_commit_in_async_mode(tmp_path):
+    cfg = Settings(
+        database_url=f"sqlite:///{tmp_path / 'group_async.db'}",
+        db_async=True,
+        session_group_commit=True,
+    )
+    with TestClient(create_app(cfg)) as c:
+        ex_id = c.post("/exercises", json={
+            "name": "Async class", "side": "left", "category": "mobility",
+        }).json()["id"]
+        r = c.post("/sessions", json={"exercise_id": ex_id, "date": "2033-03-01"})
+        assert r.status_code == 200
+        assert c.get(f"/sessions/{r.json()['id']}").json()["exercise_id"] == ex_id
+        r = c.post("/sessions", json={"exercise_id": 999_999, "date": "2033-03-01"})
+        assert r.status_code == 400
+
+
+def test_cancelled_caller_does_not_stop_the_writer():
+    db = SessionLocal()
+    ex = exercise_service.create_exercise(db, ExerciseCreate(
+        name="Cancelled", side="right", category="strength",
+    ))
+    writer = GroupCommitWriter(SessionLocal, max_batch=10, window_s=0.01)
+    gave_up = writer.submit(SessionCreate(exercise_id=ex.id, date="2033-04-01"))
+    waited = writer.submit(SessionCreate(exercise_id=ex.id, date="2033-04-02"))
+    # e.g. the client disconnected while its insert was queued
+    assert gave_up.cancel()
+    writer.start()
+    assert waited.result(timeout=10)["date"].isoformat() == "2033-04-02"
+    later = writer.submit(SessionCreate(exercise_id=ex.id, date="2033-04-03"))
+    assert later.result(timeout=10)["exercise_id"] == ex.id
+    writer.stop()
+
+    dates = {
+        s.date.isoformat()
+        for s in db.query(models.ExerciseSession).filter_by(exercise_id=ex.id)
+    }
+    assert dates == {"2033-04-02", "2033-04-03"}
+    db.close()
+
+
+def test_submit_racing_stop_is_still_answered():
+    db = SessionLocal()
+    ex = exercise_service.create_exercise(db, ExerciseCreate(
+        name="Shutdown", side="left", category="balance",
+    ))
+    db.close()
+    writer = GroupCommitWriter(SessionLocal, window_s=0.001)
+    queue = writer._queue
+
+    class SlowPut:
+        # Stretches the gap between the closed check and the enqueue
+        def put(self, item):
+            if isinstance(item, tuple):
+                time.sleep(0.2)
+            queue.put(item)
+
+        def __getattr__(self, name):
+            return getattr(queue, name)
+
+    writer._queue = SlowPut()
+    writer.start()
+    with ThreadPoolExecutor(1) as pool:
+        submitted = pool.submit(
+            writer.submit, SessionCreate(exercise_id=ex.id, date="2033-05-01")
+        )
+        time.sleep(0.05)
+        writer.stop()
+        future = submitted.result()
+    assert future.result(timeout=5)["exercise_id"] == ex.id
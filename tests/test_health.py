@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+
+import app.database as app_db
+from app.config import Settings
+from app.main import create_app
+
+
+def count_statements(engine, fn):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return len(statements)
+
+
+def test_livez_never_touches_the_database(client):
+    def probe():
+        for _ in range(5):
+            assert client.get("/livez").json() == {"status": "ok"}
+
+    assert count_statements(app_db.engine, probe) == 0
+
+
+def test_readyz_reuses_check_within_ttl(client, monkeypatch):
+    from app.routers import health
+
+    monkeypatch.setattr(health, "db_ready", health.CachedCheck())
+
+    def probe():
+        for _ in range(5):
+            r = client.get("/readyz")
+            assert r.status_code == 200
+            assert r.json() == {"status": "ready", "db": "ok"}
+
+    assert count_statements(app_db.engine, probe) == 1
+
+
+def test_readyz_reports_unreachable_database(tmp_path):
+    cfg = Settings(
+        database_url=f"sqlite:///{tmp_path / 'missing' / 'x.db'}",
+        readiness_ttl_s=0,
+    )
+    # No lifespan: schema setup would fail on the missing directory too
+    r = TestClient(create_app(cfg)).get("/readyz")
+    assert r.status_code == 503
+    assert r.json()["db"] == "error"
+    # /livez stays up so the orchestrator does not restart the process
+    assert TestClient(create_app(cfg)).get("/livez").status_code == 200
+
+
+def test_pool_gauges_exported(tmp_path):
+    cfg = Settings(database_url=f"sqlite:///{tmp_path / 'pool.db'}", db_pool_size=3)
+    waits = REGISTRY.get_sample_value("db_pool_wait_seconds_count") or 0
+    with TestClient(create_app(cfg)) as c:
+        c.get("/exercises")
+        text = c.get("/metrics").text
+        assert 'db_pool_size{pool="sync"} 3.0' in text
+        assert 'db_pool_checked_out{pool="sync"}' in text
+        assert 'db_pool_checked_in{pool="sync"}' in text
+        assert 'db_pool_overflow{pool="sync"}' in text
+    assert REGISTRY.get_sample_value("db_pool_wait_seconds_count") > waits
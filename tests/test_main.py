@@ -8,3 +8,33 @@ def test_read_root():
     response = client.get("/")
     assert response.status_code == 200
     assert "Knee Rehab" in response.text
+
+
+def test_create_app_defers_schema_setup_to_startup(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+    from app.config import Settings
+    from app.database import Base
+    from app.main import create_app
+    from app.migrations import SCHEMA_VERSION
+
+    db_file = tmp_path / "factory.db"
+    cfg = Settings(database_url=f"sqlite:///{db_file}")
+    factory_app = create_app(cfg)
+    assert not db_file.exists()
+
+    with TestClient(factory_app) as c:
+        r = c.post("/exercises", json={
+            "name": "Factory", "side": "left", "category": "balance",
+        })
+        assert r.status_code == 200
+    with create_engine(cfg.database_url).connect() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+    assert version == SCHEMA_VERSION
+
+    # A current database skips create_all and the migrations on later starts
+    def fail(*args, **kwargs):
+        raise AssertionError("schema setup ran on an up-to-date database")
+
+    monkeypatch.setattr(Base.metadata, "create_all", fail)
+    with TestClient(create_app(cfg)) as c:
+        assert [e["name"] for e in c.get("/exercises").json()] == ["Factory"]
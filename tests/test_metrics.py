@@ -0,0 +1,33 @@
+from prometheus_client import REGISTRY
+
+from app.config import Settings
+from app.metrics import UNMATCHED
+
+
+def count(method, path, status):
+    labels = {"method": method, "path": path, "status": status}
+    return REGISTRY.get_sample_value("http_requests_total", labels) or 0
+
+
+def test_metrics_use_route_templates(client):
+    before = count("GET", "/sessions/{id}", "404")
+    client.get("/sessions/987654")
+    client.get("/sessions/987655")
+    assert count("GET", "/sessions/{id}", "404") == before + 2
+
+    client.get("/static/styles.css")
+    assert count("GET", "/static", "200") >= 1
+
+    before = count("GET", UNMATCHED, "404")
+    client.get("/no/such/page/12345")
+    assert count("GET", UNMATCHED, "404") == before + 1
+
+    text = client.get("/metrics").text
+    assert 'path="/sessions/987654"' not in text
+    assert 'path="/no/such/page/12345"' not in text
+
+
+def test_latency_buckets_setting():
+    assert Settings().latency_buckets()[-1] == float("inf")
+    buckets = Settings(metrics_latency_buckets="0.5, 0.01,0.1").latency_buckets()
+    assert buckets == (0.01, 0.1, 0.5, float("inf"))
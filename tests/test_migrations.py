@@ -0,0 +1,86 @@
+from sqlalchemy import create_engine, inspect
+
+from app.migrations import SCHEMA_VERSION, run_migrations
+
+
+def test_migrations_add_indexes_to_existing_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE sessions (id INTEGER PRIMARY KEY, "
+            "exercise_id INTEGER NOT NULL, date DATE NOT NULL)"
+        )
+        conn.exec_driver_sql("INSERT INTO sessions VALUES (1, 1, '2024-01-01')")
+
+    assert run_migrations(engine) == SCHEMA_VERSION
+    # Running again is a no-op
+    assert run_migrations(engine) == SCHEMA_VERSION
+
+    names = {ix["name"] for ix in inspect(engine).get_indexes("sessions")}
+    assert {"ix_sessions_exercise_date_id", "ix_sessions_date_id"} <= names
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM sessions").scalar() == 1
+
+
+def test_migrations_convert_schedule_json_to_bitmask(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy_ex.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE exercises (id INTEGER PRIMARY KEY, name VARCHAR(120) "
+            "NOT NULL, side VARCHAR(10) NOT NULL, category VARCHAR(20) NOT NULL, "
+            "schedule_dow TEXT NOT NULL)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO exercises VALUES "
+            "(1, 'Squat', 'left', 'strength', '[1, 3, 5]'), "
+            "(2, 'Plank', 'both', 'balance', '[]')"
+        )
+
+    run_migrations(engine)
+
+    cols = {c["name"] for c in inspect(engine).get_columns("exercises")}
+    assert "schedule_mask" in cols and "schedule_dow" not in cols
+    with engine.connect() as conn:
+        masks = dict(
+            conn.exec_driver_sql("SELECT id, schedule_mask FROM exercises").all()
+        )
+    assert masks == {1: 0b0101010, 2: 0}
+
+
+def test_migrations_rebuild_sessions_with_cascading_foreign_key(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy_fk.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE exercises (id INTEGER PRIMARY KEY, name VARCHAR(120) "
+            "NOT NULL, side VARCHAR(10) NOT NULL, category VARCHAR(20) NOT NULL)"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE sessions (id INTEGER PRIMARY KEY, exercise_id INTEGER "
+            "NOT NULL REFERENCES exercises (id), date DATE NOT NULL, notes TEXT)"
+        )
+        conn.exec_driver_sql("INSERT INTO exercises VALUES (1, 'Squat', 'l', 's')")
+        # Session 3 points at an exercise that was deleted long ago
+        conn.exec_driver_sql(
+            "INSERT INTO sessions VALUES (1, 1, '2024-01-01', 'a'), "
+            "(2, 1, '2024-01-02', NULL), (3, 7, '2024-01-03', 'orphan')"
+        )
+
+    run_migrations(engine)
+
+    fks = inspect(engine).get_foreign_keys("sessions")
+    assert fks[0]["referred_table"] == "exercises"
+    assert fks[0]["options"]["ondelete"] == "CASCADE"
+    names = {ix["name"] for ix in inspect(engine).get_indexes("sessions")}
+    assert "ix_sessions_exercise_date_id" in names
+    with engine.begin() as conn:
+        rows = conn.exec_driver_sql(
+            "SELECT id, exercise_id, date, notes FROM sessions ORDER BY id"
+        ).all()
+        assert rows == [(1, 1, "2024-01-01", "a"), (2, 1, "2024-01-02", None)]
+        # Existing notes are indexed for full-text search
+        assert conn.exec_driver_sql(
+            "SELECT rowid FROM sessions_fts WHERE sessions_fts MATCH 'a'"
+        ).all() == [(1,)]
+        conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+        conn.exec_driver_sql("DELETE FROM exercises WHERE id = 1")
+        assert conn.exec_driver_sql("SELECT count(*) FROM sessions").scalar() == 0
@@ -1,5 +1,5 @@
 # Tests for models (example: Exercise)
-from app.models import Exercise
+from app.models import Exercise, dow_to_mask, mask_to_dow
 
 def test_exercise_model():
     ex = Exercise(
@@ -10,7 +10,7 @@ def test_exercise_model():
         target_sets=3,
         target_reps=10,
         target_hold_sec=5,
-        schedule_dow="[1,3,5]",
+        schedule_mask=dow_to_mask([1, 3, 5]),
     )
     assert ex.id == 1
     assert ex.name == "Squat"
@@ -19,4 +19,5 @@ def test_exercise_model():
     assert ex.target_sets == 3
     assert ex.target_reps == 10
     assert ex.target_hold_sec == 5
-    assert ex.schedule_dow == "[1,3,5]"
+    assert ex.schedule_mask == 0b0101010
+    assert mask_to_dow(ex.schedule_mask) == [1, 3, 5]
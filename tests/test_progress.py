@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import models
+from app.database import SessionLocal
+from app.services.progress import exercise_progress
+
+
+def test_progress_rolling_means_slope_and_wow(client, create_exercise):
+    ex = create_exercise("Progress A")
+    start = date(2022, 1, 1)
+    # ROM climbs 1 deg/day; pain missing on day 0 and two sessions on day 10
+    client.post("/sessions/bulk", json=[
+        {"exercise_id": ex, "date": str(start + timedelta(days=i)),
+         "rom_deg": 80 + i, "pain_0_10": None if i == 0 else 5}
+        for i in range(21)
+    ] + [{"exercise_id": ex, "date": str(start + timedelta(days=10)),
+          "rom_deg": 100, "pain_0_10": 9}])
+
+    r = client.get(f"/exercises/{ex}/progress")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["sessions"] == 22
+    assert body["first_date"] == "2022-01-01"
+    assert body["last_date"] == "2022-01-21"
+    assert len(body["points"]) == 21
+
+    by_day = {p["date"]: p for p in body["points"]}
+    first = by_day["2022-01-01"]
+    assert first["rom_mean"] == 80
+    assert first["pain_mean"] is None
+    assert first["rom_wow"] is None
+
+    # Day 10 averages both sessions
+    assert by_day["2022-01-11"]["rom_mean"] == 95
+    assert by_day["2022-01-11"]["pain_mean"] == 7
+
+    # Day 20: trailing 7 days are days 14..20, previous week days 7..13
+    # (which include the extra day-10 session at 100)
+    last = by_day["2022-01-21"]
+    assert last["rom_7d"] == 97
+    assert last["rom_28d"] == pytest.approx((sum(range(80, 101)) + 100) / 22, abs=0.01)
+    prev_week = (sum(range(87, 94)) + 100) / 8
+    assert last["rom_wow"] == pytest.approx(97 - prev_week, abs=0.01)
+    assert body["rom_wow_delta"] == last["rom_wow"]
+    assert body["rom_slope_per_week"] == pytest.approx(7.0, abs=0.5)
+
+
+def test_progress_date_filter_and_404(client, create_exercise):
+    ex = create_exercise("Progress B")
+    client.post("/sessions/bulk", json=[
+        {"exercise_id": ex, "date": d, "rom_deg": 90, "pain_0_10": 3}
+        for d in ("2022-02-01", "2022-02-10", "2022-03-01")
+    ])
+    body = client.get(
+        f"/exercises/{ex}/progress",
+        params={"from_date": "2022-02-05", "to_date": "2022-02-28"},
+    ).json()
+    assert [p["date"] for p in body["points"]] == ["2022-02-10"]
+    # A flat or single-point series has no meaningful trend
+    assert body["rom_slope_per_week"] is None
+
+    assert client.get("/exercises/999999/progress").status_code == 404
+
+
+def test_batch_progress_matches_single(client, create_exercise):
+    a = create_exercise("Progress batch A")
+    b = create_exercise("Progress batch B")
+    empty = create_exercise("Progress batch empty")
+    client.post("/sessions/bulk", json=[
+        {"exercise_id": ex, "date": f"2021-05-{day:02d}",
+         "rom_deg": 70 + day * k, "pain_0_10": 8 - day % 5}
+        for ex, k in ((a, 1), (b, 2))
+        for day in range(1, 29)
+    ])
+
+    r = client.get("/exercises/progress")
+    assert r.status_code == 200
+    batch = {p["exercise_id"]: p for p in r.json()}
+    assert batch[empty]["sessions"] == 0
+    assert batch[empty]["points"] == []
+
+    db = SessionLocal()
+    try:
+        for ex in (a, b):
+            single = exercise_progress(db, ex)
+            single["first_date"] = str(single["first_date"])
+            single["last_date"] = str(single["last_date"])
+            for p in single["points"]:
+                p["date"] = str(p["date"])
+            assert batch[ex] == single
+        assert db.query(models.Exercise).count() == len(batch)
+    finally:
+        db.close()
@@ -0,0 +1,79 @@
+from datetime import date
+
+from app import models
+from app.database import SessionLocal
+from app.services import rollups
+from app.services import sessions as session_service
+
+
+def query_plan(db, query):
+    compiled = query.statement.compile(
+        dialect=db.bind.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = [compiled.params[k] for k in compiled.positiontup]
+    params = [p.isoformat() if isinstance(p, date) else p for p in params]
+    rows = db.connection().exec_driver_sql(
+        "EXPLAIN QUERY PLAN " + compiled.string, tuple(params)
+    )
+    return " | ".join(r[3] for r in rows)
+
+
+def test_list_sessions_filters_use_index_without_sort():
+    db = SessionLocal()
+    combos = [
+        {},
+        {"from_date": date(2024, 1, 1)},
+        {"from_date": date(2024, 1, 1), "to_date": date(2024, 2, 1)},
+        {"exercise_id": 1},
+        {"exercise_id": 1, "from_date": date(2024, 1, 1)},
+    ]
+    try:
+        for filters in combos:
+            plan = query_plan(db, session_service._filtered_sessions(db, **filters))
+            assert "USING INDEX ix_sessions_" in plan, (filters, plan)
+            assert "TEMP B-TREE" not in plan, (filters, plan)
+    finally:
+        db.close()
+
+
+def test_keyset_page_seek_uses_index():
+    db = SessionLocal()
+    try:
+        s = models.ExerciseSession(id=10, date=date(2024, 1, 1))
+        cursor = session_service.encode_cursor(s)
+        q = session_service._filtered_sessions(db, exercise_id=1).filter(
+            session_service.seek_after(cursor)
+        ).limit(50)
+        plan = query_plan(db, q)
+        assert "ix_sessions_exercise_date_id" in plan
+        assert "TEMP B-TREE" not in plan
+    finally:
+        db.close()
+
+
+
+def test_due_exercises_query_uses_mask_index():
+    db = SessionLocal()
+    try:
+        q = db.query(models.Exercise).filter(
+            models.Exercise.schedule_mask.in_(models.masks_with_day(2))
+        )
+        plan = query_plan(db, q)
+        assert "USING INDEX ix_exercises_schedule_mask" in plan, plan
+    finally:
+        db.close()
+
+
+def test_rollup_refresh_looks_up_each_key():
+    db = SessionLocal()
+    try:
+        keys = [(1, date(2024, 1, 1)), (2, date(2024, 1, 2))]
+        for n in (1, 2):
+            q = db.query(models.ExerciseSession).filter(
+                rollups._matching(models.ExerciseSession, keys[:n])
+            )
+            plan = query_plan(db, q)
+            assert "ix_sessions_exercise_date_id (exercise_id=? AND date=?)" in plan
+            assert "SCAN" not in plan, plan
+    finally:
+        db.close()
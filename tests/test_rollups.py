@@ -0,0 +1,72 @@
+from app import models
+from app.database import SessionLocal
+from app.services.rollups import rebuild_rollups
+
+
+def daily(client, **params):
+    r = client.get("/sessions/daily", params=params)
+    assert r.status_code == 200
+    return {(d["exercise_id"], d["date"]): d for d in r.json()}
+
+
+def rollup_rows(db, ex_ids):
+    return sorted(
+        (r.exercise_id, r.date, r.session_count, r.pain_sum, r.pain_count,
+         r.pain_min, r.pain_max, r.rom_max, r.volume)
+        for r in db.query(models.SessionDailyRollup).filter(
+            models.SessionDailyRollup.exercise_id.in_(ex_ids)
+        )
+    )
+
+
+def test_rollup_follows_create_update_delete(
+    client, create_exercise, create_session
+):
+    a = create_exercise("Rollup A")
+    b = create_exercise("Rollup B")
+    s1 = create_session(
+        a, "2023-03-01", sets=3, reps=10, pain_0_10=2, rom_deg=90
+    )["id"]
+    s2 = create_session(
+        a, "2023-03-01", sets=2, reps=5, pain_0_10=6, rom_deg=110
+    )["id"]
+    client.post("/sessions/bulk", json=[
+        {"exercise_id": b, "date": "2023-03-01", "pain_0_10": 4},
+        {"exercise_id": b, "date": "2023-03-02", "sets": 1, "reps": 1},
+    ])
+
+    day = daily(client, exercise_id=a)[(a, "2023-03-01")]
+    assert day["session_count"] == 2
+    assert day["pain_mean"] == 4
+    assert (day["pain_min"], day["pain_max"], day["rom_max"]) == (2, 6, 110)
+    assert day["volume"] == 40
+
+    # Move the session holding the max to another exercise and date
+    client.put(f"/sessions/{s2}", json={"exercise_id": b, "date": "2023-03-02"})
+    rows = daily(client, from_date="2023-03-01", to_date="2023-03-02")
+    assert rows[(a, "2023-03-01")]["pain_max"] == 2
+    assert rows[(a, "2023-03-01")]["rom_max"] == 90
+    assert rows[(b, "2023-03-02")]["session_count"] == 2
+    assert rows[(b, "2023-03-02")]["volume"] == 11
+
+    client.delete(f"/sessions/{s1}")
+    assert (a, "2023-03-01") not in daily(client, exercise_id=a)
+
+    combined = client.get(
+        "/sessions/daily?by_exercise=false&from_date=2023-03-01&to_date=2023-03-02"
+    ).json()
+    assert [d["exercise_id"] for d in combined] == [None, None]
+    assert [d["session_count"] for d in combined] == [1, 2]
+
+    # Incremental maintenance agrees with a full rebuild
+    db = SessionLocal()
+    try:
+        before = rollup_rows(db, [a, b])
+        rebuild_rollups(db)
+        db.commit()
+        assert rollup_rows(db, [a, b]) == before
+    finally:
+        db.close()
+
+    client.delete(f"/exercises/{b}")
+    assert daily(client, exercise_id=b) == {}
@@ -0,0 +1,80 @@
+from app.database import SessionLocal
+from app.services.search import fts_query, reindex
+
+
+def search(client, **params):
+    r = client.get("/sessions/search", params=params)
+    assert r.status_code == 200
+    return r.json()
+
+
+def ids(page):
+    return [item["id"] for item in page["items"]]
+
+
+def test_search_ranks_filters_and_paginates(
+    client, create_exercise, create_session
+):
+    a = create_exercise("Search A")
+    b = create_exercise("Search B")
+
+    def log(ex, day, notes):
+        return create_session(ex, day, notes=notes)["id"]
+
+    best = log(a, "2026-01-02", "zqknee swelling after zqknee stairs")
+    other = log(a, "2026-01-03", "mild zqknee swelling in the evening")
+    log(a, "2026-01-04", "zqknee fine today")
+    far = log(b, "2026-02-01", "zqknee swelled badly, iced it")
+
+    page = search(client, q="zqknee swelling")
+    # Porter stemming: "swelled" matches "swelling"; repeated term ranks first
+    assert ids(page)[0] == best
+    assert sorted(ids(page)) == sorted([best, other, far])
+    scores = [item["score"] for item in page["items"]]
+    assert scores == sorted(scores, reverse=True)
+    assert "[zqknee]" in page["items"][0]["snippet"]
+    assert page["next_offset"] is None
+
+    assert ids(search(client, q="zqknee swelling", exercise_id=b)) == [far]
+    assert ids(search(
+        client, q="zqknee swelling", from_date="2026-01-03", to_date="2026-01-31"
+    )) == [other]
+
+    first = search(client, q="zqknee", limit=2)
+    assert len(first["items"]) == 2 and first["next_offset"] == 2
+    rest = search(client, q="zqknee", limit=2, offset=2)
+    assert rest["next_offset"] is None
+    assert len(set(ids(first)) | set(ids(rest))) == 4
+
+
+def test_search_index_follows_updates_and_deletes(
+    client, create_exercise, create_session
+):
+    ex = create_exercise("Search C")
+    sid = create_session(ex, "2026-03-01", notes="zqclicking noise")["id"]
+    assert ids(search(client, q="zqclick*")) == [sid]
+
+    client.put(f"/sessions/{sid}", json={"notes": "zqgrinding noise"})
+    assert ids(search(client, q="zqclicking")) == []
+    assert ids(search(client, q="zqgrinding")) == [sid]
+
+    # Cascaded delete via the exercise fires the sessions delete trigger too
+    client.delete(f"/exercises/{ex}")
+    assert ids(search(client, q="zqgrinding")) == []
+
+    db = SessionLocal()
+    try:
+        reindex(db.connection())
+        db.commit()
+    finally:
+        db.close()
+    assert ids(search(client, q="zqgrinding")) == []
+
+
+def test_search_input_is_not_fts_syntax(client):
+    assert fts_query('knee "swelling') == '"knee" """swelling"'
+    assert fts_query("swell* AND") == '"swell"* "AND"'
+    # Unbalanced quotes and operators are searched literally, not errors
+    assert search(client, q='NEAR( "x')["items"] == []
+    assert search(client, q="***")["items"] == []
+    assert client.get("/sessions/search", params={"q": ""}).status_code == 422
@@ -56,3 +56,53 @@ def test_update_and_delete_exercise():
     # delete via API
     rdel = client.delete(f"/exercises/{ex_id}")
     assert rdel.status_code == 204
+
+
+def test_delete_exercise_cost_is_flat_in_session_count():
+    from datetime import date, timedelta
+    from sqlalchemy import event
+    from app import models
+    import app.database as app_db
+    from app.services.rollups import rebuild_rollups
+
+    def delete_with(n_sessions):
+        db = SessionLocal()
+        ex = models.Exercise(name=f"Delete {n_sessions}", side="both",
+                             category="strength")
+        db.add(ex)
+        db.flush()
+        start = date(2010, 1, 1)
+        db.bulk_insert_mappings(models.ExerciseSession, [
+            {"exercise_id": ex.id, "date": start + timedelta(days=i % 3000)}
+            for i in range(n_sessions)
+        ])
+        # Bulk inserts skip the service layer that maintains the rollups
+        rebuild_rollups(db)
+        db.commit()
+        ex_id = ex.id
+        db.expunge_all()
+
+        def rollups():
+            return db.query(models.SessionDailyRollup).filter_by(
+                exercise_id=ex_id
+            ).count()
+
+        assert rollups() == min(n_sessions, 3000)
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(app_db.engine, "before_cursor_execute", listener)
+        try:
+            assert services.exercises.delete_exercise(db, ex_id)
+        finally:
+            event.remove(app_db.engine, "before_cursor_execute", listener)
+        left = db.query(models.ExerciseSession).filter_by(exercise_id=ex_id).count()
+        assert left == 0 and rollups() == 0
+        db.close()
+        return statements
+
+    small, large = delete_with(10), delete_with(5000)
+    # Same statements whatever the history size: no child SELECT, no per-row
+    # DELETE, the database cascades
+    assert len(small) == len(large)
+    assert not any("FROM sessions" in s for s in large)
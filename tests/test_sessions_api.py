@@ -1,19 +1,8 @@
 from datetime import date
 
 
-def create_exercise(client):
-    payload = {
-        "name": "Heel Raise",
-        "side": "both",
-        "category": "strength",
-    }
-    r = client.post("/exercises", json=payload)
-    assert r.status_code == 200
-    return r.json()["id"]
-
-
-def test_sessions_crud_and_filters(client):
-    ex_id = create_exercise(client)
+def test_sessions_crud_and_filters(client, create_exercise):
+    ex_id = create_exercise()
 
     session_payload = {
         "exercise_id": ex_id,
@@ -65,3 +54,150 @@ def test_create_session_invalid_exercise(client):
     payload = {"exercise_id": 999999, "date": date.today().isoformat()}
     r = client.post("/sessions", json=payload)
     assert r.status_code == 400
+
+
+def test_list_sessions_keyset_pagination(client, create_exercise):
+    ex_id = create_exercise()
+    created = []
+    for day in ("2024-03-01", "2024-03-02", "2024-03-02", "2024-03-03", "2024-03-04"):
+        r = client.post("/sessions", json={"exercise_id": ex_id, "date": day})
+        assert r.status_code == 200
+        created.append(r.json())
+    expected = [
+        s["id"]
+        for s in sorted(created, key=lambda s: (s["date"], s["id"]), reverse=True)
+    ]
+
+    seen = []
+    cursor = None
+    while True:
+        url = f"/sessions?exercise_id={ex_id}&limit=2"
+        if cursor:
+            url += f"&cursor={cursor}"
+        r = client.get(url)
+        assert r.status_code == 200
+        page = r.json()
+        assert len(page["items"]) <= 2
+        seen.extend(i["id"] for i in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+    # Unpaginated call still returns a plain list
+    r = client.get(f"/sessions?exercise_id={ex_id}")
+    assert [i["id"] for i in r.json()] == expected
+
+
+def test_list_sessions_invalid_cursor(client):
+    r = client.get("/sessions?limit=5&cursor=not-a-cursor")
+    assert r.status_code == 400
+
+
+def test_session_series_buckets(client, create_exercise):
+    ex_id = create_exercise()
+    rows = [
+        ("2024-05-06", 2, 90),   # Monday
+        ("2024-05-06", 4, 100),
+        ("2024-05-08", 6, None),  # Wednesday, same week
+        ("2024-06-03", None, 120),
+    ]
+    for day, pain, rom in rows:
+        r = client.post("/sessions", json={
+            "exercise_id": ex_id, "date": day, "pain_0_10": pain, "rom_deg": rom,
+        })
+        assert r.status_code == 200
+
+    r = client.get(f"/sessions/series?exercise_id={ex_id}&bucket=day")
+    assert r.status_code == 200
+    day_points = r.json()
+    assert [p["bucket"] for p in day_points] == [
+        "2024-05-06", "2024-05-08", "2024-06-03",
+    ]
+    first = day_points[0]
+    assert first["count"] == 2
+    assert first["pain_mean"] == 3
+    assert (first["pain_min"], first["pain_max"]) == (2, 4)
+    assert (first["rom_min"], first["rom_max"]) == (90, 100)
+
+    r = client.get(f"/sessions/series?exercise_id={ex_id}&bucket=week")
+    weeks = r.json()
+    assert [p["bucket"] for p in weeks] == ["2024-05-06", "2024-06-03"]
+    assert weeks[0]["count"] == 3
+    assert weeks[0]["pain_max"] == 6
+
+    r = client.get(f"/sessions/series?exercise_id={ex_id}&bucket=month")
+    months = r.json()
+    assert [p["bucket"] for p in months] == ["2024-05-01", "2024-06-01"]
+    assert months[1]["pain_mean"] is None
+    assert months[1]["rom_mean"] == 120
+
+    r = client.get("/sessions/series?bucket=year")
+    assert r.status_code == 422
+
+
+def test_bulk_create_sessions(client, create_exercise):
+    ex_id = create_exercise()
+    rows = [
+        {"exercise_id": ex_id, "date": "2024-07-01", "sets": 3},
+        {"exercise_id": 999999, "date": "2024-07-01"},
+        {"exercise_id": ex_id, "date": "not-a-date"},
+        {"exercise_id": ex_id, "date": "2024-07-02", "pain_0_10": 1},
+    ]
+    r = client.post("/sessions/bulk", json=rows)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["created"] == 2
+    assert body["failed"] == 2
+    results = body["results"]
+    assert results[1]["error"] == "Exercise does not exist"
+    assert results[2]["error"]
+    created = client.get(f"/sessions/{results[3]['id']}").json()
+    assert created["date"] == "2024-07-02"
+    assert created["pain_0_10"] == 1
+
+
+def test_bulk_create_sessions_ndjson(client, create_exercise):
+    ex_id = create_exercise()
+    body = "\n".join(
+        f'{{"exercise_id": {ex_id}, "date": "2024-08-0{d}"}}' for d in range(1, 4)
+    )
+    r = client.post(
+        "/sessions/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    ids = [res["id"] for res in r.json()["results"]]
+    assert len(ids) == 3 and ids == sorted(ids)
+
+    r = client.post("/sessions/bulk", json={"exercise_id": ex_id})
+    assert r.status_code == 400
+
+
+def test_export_sessions_csv_and_ndjson(client, create_exercise):
+    import csv
+    import io
+    import json
+
+    ex_id = create_exercise()
+    for day in ("2024-09-01", "2024-09-02", "2024-09-03"):
+        client.post("/sessions", json={"exercise_id": ex_id, "date": day, "reps": 5})
+
+    r = client.get(
+        f"/sessions/export?format=csv&exercise_id={ex_id}&from_date=2024-09-02"
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["date"] for row in rows] == ["2024-09-03", "2024-09-02"]
+    assert rows[0]["reps"] == "5"
+
+    r = client.get(f"/sessions/export?format=ndjson&exercise_id={ex_id}")
+    assert r.status_code == 200
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert len(records) == 3
+    assert records[-1]["date"] == "2024-09-01"
+
+    r = client.get("/sessions/export?format=xml")
+    assert r.status_code == 422